@@ -1,7 +1,9 @@
 from app.agents.chart_agent import chart_agent
 from app.agents.zerodha_agent.agent import get_zerodha_agent
+from app.agents.financial_analyst.agent import get_financial_analyst
 
 ___all__ = [
     chart_agent,
-    get_zerodha_agent
+    get_zerodha_agent,
+    get_financial_analyst
 ]
\ No newline at end of file
@@ -11,6 +11,9 @@ from pydantic_ai import Agent, RunContext
 from typing import List, Dict, Optional, Union, Any
 
 from app.utils import model, CHART_AGENT_SYSTEM_PROMPT
+from app.tools.chart_renderers import render_histogram, render_line_chart, render_bar_chart, render_scatter_plot
+from app.tools.render_pool import render_chart
+from app.tools.artifacts import get_artifact_store
 # from model import model
 # from prompts import CHART_AGENT_SYSTEM_PROMPT 
 
@@ -29,18 +32,10 @@ chart_agent = Agent(
     retries=2
 )
 
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import List, Dict, Optional
-import base64
-import io
-
-plt.style.use('default')
-sns.set_palette("husl")
-plt.ioff()
 
 @chart_agent.tool
-def create_histogram(
+async def create_histogram(
     ctx: RunContext[Deps],
     data: Optional[List[float]] = None, 
     title: Optional[str] = None,
@@ -48,7 +43,8 @@ def create_histogram(
     x_label: Optional[str] = None,
     y_label: Optional[str] = None,
     color: str = 'skyblue',
-    sample_size: int = 1000
+    sample_size: int = 1000,
+    profile: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Create a histogram for numerical data distribution.
@@ -62,46 +58,39 @@ def create_histogram(
         y_label: Y-axis label (optional)
         color: Bar color (default: 'skyblue')
         sample_size: Size of random data if data is None (default: 1000)
+        profile: Rendering profile, 'preview' (default, small WebP for the chat), 'compact', 'export' (300 dpi PNG) or 'vector' (SVG)
     
     Returns:
-        Dictionary with base64 image data and metadata
+        Dictionary with the chart's artifact handle and metadata
     """
     # Generate random data if none provided
     if data is None:
         np.random.seed(42)  # For reproducible results
         data = np.random.normal(50, 15, sample_size).tolist()
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.hist(data, bins=bins, color=color, alpha=0.7, edgecolor='black')
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Distribution Histogram', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel(x_label or 'Values', fontsize=12)
-    ax.set_ylabel(y_label or 'Frequency', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
+    spec = {
+        "data": data,
+        "title": title,
+        "bins": bins,
+        "x_label": x_label,
+        "y_label": y_label,
+        "color": color,
+    }
+    image = await render_chart(render_histogram, spec, profile)
     
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
+    chart = {
+        "mime_type": image.mime_type,
+        "profile": image.profile,
         "chart_type": "histogram",
         "data_points": len(data),
         "title": title or "Distribution Histogram"
     }
+    # Only the handle goes back to the model, the UI resolves it to the image
+    artifact = get_artifact_store().put(image.data, image.mime_type, chart)
+    return {"artifact": artifact.handle, "bytes": artifact.size, **chart}
 
 @chart_agent.tool
-def create_line_chart(
+async def create_line_chart(
     ctx: RunContext[Deps],
     x_data: Optional[List[Union[float, int]]] = None,
     y_data: Optional[List[Union[float, int]]] = None,
@@ -111,7 +100,8 @@ def create_line_chart(
     color: str = 'blue',
     line_style: str = '-',
     marker: str = 'o',
-    sample_size: int = 50
+    sample_size: int = 50,
+    profile: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Create a line chart.
@@ -127,9 +117,10 @@ def create_line_chart(
         line_style: Line style ('-', '--', '-.', ':')
         marker: Marker style ('o', 's', '^', 'v', etc.)
         sample_size: Size of random data if data is None
+        profile: Rendering profile, 'preview' (default, small WebP for the chat), 'compact', 'export' (300 dpi PNG) or 'vector' (SVG)
     
     Returns:
-        Dictionary with base64 image data and metadata
+        Dictionary with the chart's artifact handle and metadata
     """
     # Generate data if none provided
     if x_data is None:
@@ -138,37 +129,31 @@ def create_line_chart(
         np.random.seed(42)
         y_data = np.cumsum(np.random.randn(len(x_data))).tolist()
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(x_data, y_data, color=color, linestyle=line_style, marker=marker, markersize=4)
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Line Chart', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel(x_label or 'X Values', fontsize=12)
-    ax.set_ylabel(y_label or 'Y Values', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
+    spec = {
+        "x_data": x_data,
+        "y_data": y_data,
+        "title": title,
+        "x_label": x_label,
+        "y_label": y_label,
+        "color": color,
+        "line_style": line_style,
+        "marker": marker,
+    }
+    image = await render_chart(render_line_chart, spec, profile)
     
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
+    chart = {
+        "mime_type": image.mime_type,
+        "profile": image.profile,
         "chart_type": "line_chart",
         "data_points": len(x_data),
         "title": title or "Line Chart"
     }
+    # Only the handle goes back to the model, the UI resolves it to the image
+    artifact = get_artifact_store().put(image.data, image.mime_type, chart)
+    return {"artifact": artifact.handle, "bytes": artifact.size, **chart}
 
 @chart_agent.tool
-def create_bar_chart(
+async def create_bar_chart(
     ctx: RunContext[Deps],
     categories: Optional[List[str]] = None,
     values: Optional[List[Union[float, int]]] = None,
@@ -176,7 +161,8 @@ def create_bar_chart(
     x_label: Optional[str] = None,
     y_label: Optional[str] = None,
     color: str = 'steelblue',
-    horizontal: bool = False
+    horizontal: bool = False,
+    profile: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Create a bar chart.
@@ -190,9 +176,10 @@ def create_bar_chart(
         y_label: Y-axis label
         color: Bar color
         horizontal: Whether to create horizontal bars
+        profile: Rendering profile, 'preview' (default, small WebP for the chat), 'compact', 'export' (300 dpi PNG) or 'vector' (SVG)
     
     Returns:
-        Dictionary with base64 image data and metadata
+        Dictionary with the chart's artifact handle and metadata
     """
     # Generate data if none provided
     if categories is None:
@@ -201,44 +188,30 @@ def create_bar_chart(
         random.seed(42)
         values = [random.randint(10, 100) for _ in range(len(categories))]
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    if horizontal:
-        ax.barh(categories, values, color=color, alpha=0.7)
-        ax.set_xlabel(y_label or 'Values', fontsize=12)
-        ax.set_ylabel(x_label or 'Categories', fontsize=12)
-    else:
-        ax.bar(categories, values, color=color, alpha=0.7)
-        ax.set_xlabel(x_label or 'Categories', fontsize=12)
-        ax.set_ylabel(y_label or 'Values', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Bar Chart', fontsize=16, fontweight='bold')
-    
-    ax.grid(True, alpha=0.3, axis='y' if not horizontal else 'x')
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
+    spec = {
+        "categories": categories,
+        "values": values,
+        "title": title,
+        "x_label": x_label,
+        "y_label": y_label,
+        "color": color,
+        "horizontal": horizontal,
+    }
+    image = await render_chart(render_bar_chart, spec, profile)
     
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
+    chart = {
+        "mime_type": image.mime_type,
+        "profile": image.profile,
         "chart_type": "bar_chart",
         "data_points": len(categories),
         "title": title or "Bar Chart"
     }
+    # Only the handle goes back to the model, the UI resolves it to the image
+    artifact = get_artifact_store().put(image.data, image.mime_type, chart)
+    return {"artifact": artifact.handle, "bytes": artifact.size, **chart}
 
 @chart_agent.tool
-def create_scatter_plot(
+async def create_scatter_plot(
     ctx: RunContext[Deps],
     x_data: Optional[List[Union[float, int]]] = None,
     y_data: Optional[List[Union[float, int]]] = None,
@@ -248,7 +221,8 @@ def create_scatter_plot(
     color: str = 'red',
     size: Union[int, List[int]] = 50,
     alpha: float = 0.6,
-    sample_size: int = 100
+    sample_size: int = 100,
+    profile: Optional[str] = None
 ) -> Dict[str, str]:
     """
     Create a scatter plot.
@@ -264,9 +238,10 @@ def create_scatter_plot(
         size: Point size (int or list of sizes)
         alpha: Point transparency (0-1)
         sample_size: Size of random data if data is None
+        profile: Rendering profile, 'preview' (default, small WebP for the chat), 'compact', 'export' (300 dpi PNG) or 'vector' (SVG)
     
     Returns:
-        Dictionary with base64 image data and metadata
+        Dictionary with the chart's artifact handle and metadata
     """
     # Generate data if none provided
     if x_data is None:
@@ -276,34 +251,28 @@ def create_scatter_plot(
         np.random.seed(43)
         y_data = (2 * np.array(x_data) + np.random.randn(len(x_data))).tolist()
     
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.scatter(x_data, y_data, c=color, s=size, alpha=alpha)
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Scatter Plot', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel(x_label or 'X Values', fontsize=12)
-    ax.set_ylabel(y_label or 'Y Values', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
+    spec = {
+        "x_data": x_data,
+        "y_data": y_data,
+        "title": title,
+        "x_label": x_label,
+        "y_label": y_label,
+        "color": color,
+        "size": size,
+        "alpha": alpha,
+    }
+    image = await render_chart(render_scatter_plot, spec, profile)
     
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
+    chart = {
+        "mime_type": image.mime_type,
+        "profile": image.profile,
         "chart_type": "scatter_plot",
         "data_points": len(x_data),
         "title": title or "Scatter Plot"
     }
+    # Only the handle goes back to the model, the UI resolves it to the image
+    artifact = get_artifact_store().put(image.data, image.mime_type, chart)
+    return {"artifact": artifact.handle, "bytes": artifact.size, **chart}
 
 async def main():
     # Test different chart types
@@ -9,7 +9,7 @@ import os
 
 from pydantic_ai import Agent
 
-from app.utils import model, MCPClient, FINANCIAL_ANALYST_SYSTEM_PROMPT
+from app.utils import model, MCPClient, get_mcp_pool, FINANCIAL_ANALYST_SYSTEM_PROMPT
 
 # Get the directory where the current script is located
 SCRIPT_DIR = pathlib.Path(__file__).parent.resolve()
@@ -19,15 +19,11 @@ CONFIG_FILE = SCRIPT_DIR / "mcp_config.json"
 load_dotenv()
 
 async def get_financial_analyst():
-    client = MCPClient()
+    # Servers are borrowed from the shared pool; client.cleanup() hands them back
+    client = MCPClient(pool=get_mcp_pool())
     client.load_servers(str(CONFIG_FILE))
     tools = await client.start()
 
-    i = 1
-    for tool in tools:
-        print(f"{i}. {tool.name}: {tool.description}")
-        i += 1
-
     agent = Agent(
         model = model,
         system_prompt = FINANCIAL_ANALYST_SYSTEM_PROMPT,
@@ -83,6 +79,7 @@ async def main():
     finally:
         # Ensure proper cleanup of MCP client resources when exiting
         await mcp_client.cleanup()
+        await get_mcp_pool().close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
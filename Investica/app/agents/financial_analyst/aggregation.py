@@ -0,0 +1,164 @@
+"""Server-side reduction of historical price series.
+
+Long ranges of fine-grained bars are reduced before they are serialized so
+the payload handed to the model stays bounded whatever the date range:
+OHLC resampling to a coarser interval, LTTB downsampling to a fixed number
+of points, or a summary of returns and volatility instead of the bars.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Target intervals accepted by resample_ohlc, mapped to start-anchored pandas
+# offsets: like the API's own bars, a bar is stamped with the start of its period
+RESAMPLE_RULES = {
+    "hour": "h",
+    "day": "D",
+    "week": "W-MON",
+    "month": "MS",
+    "quarter": "QS",
+    "year": "YS",
+}
+
+# Bars per year used to annualize volatility
+PERIODS_PER_YEAR = {
+    "day": 252,
+    "week": 52,
+    "month": 12,
+    "quarter": 4,
+    "year": 1,
+}
+
+
+def to_frame(prices: list[dict]) -> pd.DataFrame:
+    """Build a time-indexed DataFrame from price bars as returned by the API."""
+    frame = pd.DataFrame(prices)
+    frame["time"] = pd.to_datetime(frame["time"], utc=True, format="mixed")
+    return frame.set_index("time").sort_index()
+
+
+def resample_ohlc(prices: list[dict], interval: str) -> list[dict]:
+    """Aggregate price bars into coarser OHLCV bars.
+
+    Args:
+        prices: Price bars with open, high, low, close, volume and time.
+        interval: Target interval, one of RESAMPLE_RULES.
+
+    Returns:
+        list[dict]: One bar per non-empty period, oldest first, each stamped
+        with the start of its period (weeks start on Monday).
+    """
+    frame = to_frame(prices)
+    aggregations = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    bars = frame.resample(RESAMPLE_RULES[interval], label="left", closed="left").agg(
+        {column: how for column, how in aggregations.items() if column in frame}
+    )
+    bars = bars.dropna(subset=["close"])
+    bars.index = bars.index.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return bars.reset_index().to_dict(orient="records")
+
+
+def lttb(prices: list[dict], max_points: int, value_key: str = "close") -> list[dict]:
+    """Downsample bars with Largest-Triangle-Three-Buckets, keeping the visual shape.
+
+    The first and last bars are always kept; in between one bar is chosen per
+    bucket, the one forming the largest triangle with its neighbours.
+
+    Args:
+        prices: Price bars, oldest first.
+        max_points: Number of bars to keep (at least 3).
+        value_key: Field used as the y value.
+
+    Returns:
+        list[dict]: The selected original bars.
+    """
+    count = len(prices)
+    if max_points >= count or max_points < 3:
+        return prices
+
+    y = np.array([float(bar.get(value_key) or 0.0) for bar in prices])
+    x = np.arange(count, dtype=float)
+    edges = np.linspace(1, count - 1, max_points - 1).astype(int)
+
+    selected = [0]
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else count
+        next_x = x[next_start:next_end].mean() if next_end > next_start else x[-1]
+        next_y = y[next_start:next_end].mean() if next_end > next_start else y[-1]
+
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(areas.argmax())
+        selected.append(previous)
+
+    selected.append(count - 1)
+    return [prices[index] for index in selected]
+
+
+def summarize(prices: list[dict], interval: str = "day") -> dict:
+    """Summarize a price series as returns, volatility and drawdown figures.
+
+    Args:
+        prices: Price bars with at least close and time.
+        interval: Interval of the bars, used to annualize volatility.
+
+    Returns:
+        dict: Summary statistics of the series.
+    """
+    frame = to_frame(prices)
+    close = frame["close"].astype(float)
+    log_returns = np.log(close).diff().dropna()
+    volatility = float(log_returns.std()) if len(log_returns) > 1 else 0.0
+    drawdown = close / close.cummax() - 1
+
+    summary = {
+        "start": frame.index[0].isoformat(),
+        "end": frame.index[-1].isoformat(),
+        "bars": len(frame),
+        "first_close": float(close.iloc[0]),
+        "last_close": float(close.iloc[-1]),
+        "high": float(frame["high"].max() if "high" in frame else close.max()),
+        "low": float(frame["low"].min() if "low" in frame else close.min()),
+        "total_return_pct": float((close.iloc[-1] / close.iloc[0] - 1) * 100),
+        "mean_return_pct": float(close.pct_change().mean() * 100) if len(close) > 1 else 0.0,
+        "volatility_pct": volatility * 100,
+        "max_drawdown_pct": float(drawdown.min() * 100),
+    }
+    if "volume" in frame:
+        summary["average_volume"] = float(frame["volume"].mean())
+    if interval in PERIODS_PER_YEAR:
+        summary["annualized_volatility_pct"] = volatility * math.sqrt(PERIODS_PER_YEAR[interval]) * 100
+    return summary
+
+
+def reduce_prices(
+    prices: list[dict],
+    interval: str,
+    resample_to: str | None = None,
+    max_points: int | None = None,
+    summary_only: bool = False,
+) -> list[dict] | dict:
+    """Apply the requested reductions to a price series.
+
+    Resampling runs before LTTB so both can be combined; ``summary_only``
+    describes the (possibly resampled) series instead of returning bars.
+
+    Raises:
+        ValueError: If ``resample_to`` is not a supported interval.
+    """
+    if resample_to:
+        if resample_to not in RESAMPLE_RULES:
+            raise ValueError(f"resample_to must be one of {', '.join(RESAMPLE_RULES)}")
+        prices = resample_ohlc(prices, resample_to)
+        interval = resample_to
+    if summary_only:
+        return summarize(prices, interval)
+    if max_points:
+        prices = lttb(prices, max_points)
+    return prices
@@ -0,0 +1,102 @@
+"""Token-efficient serialization of tool outputs.
+
+Everything a tool returns ends up in the LLM prompt, so the default is
+minified JSON with floats rounded, and tools can project records down to
+the fields the model asked for or render them as a CSV table, which drops
+the repeated keys of long statement and price lists.
+"""
+
+import csv
+import io
+import json
+import math
+import os
+from typing import Any
+
+OUTPUT_FORMATS = ("json", "csv", "pretty")
+DEFAULT_OUTPUT_FORMAT = os.getenv("FINANCIAL_DATASETS_OUTPUT_FORMAT", "json")
+# Decimal places kept for floats, negative to disable rounding
+FLOAT_PRECISION = int(os.getenv("FINANCIAL_DATASETS_FLOAT_PRECISION", "4"))
+# Significant digits kept for floats too small for FLOAT_PRECISION (sub-cent crypto prices)
+FLOAT_SIGNIFICANT_DIGITS = int(os.getenv("FINANCIAL_DATASETS_FLOAT_SIGNIFICANT_DIGITS", "6"))
+
+
+def round_float(value: float, precision: int = FLOAT_PRECISION, significant: int = FLOAT_SIGNIFICANT_DIGITS) -> float:
+    """Round ``value`` to ``precision`` decimal places, or more to keep ``significant`` digits."""
+    if value == 0 or not math.isfinite(value):
+        return value
+    magnitude = math.floor(math.log10(abs(value)))
+    return round(value, max(precision, significant - 1 - magnitude))
+
+
+def round_numbers(value: Any, precision: int = FLOAT_PRECISION) -> Any:
+    """Round every float nested in ``value`` with ``round_float``."""
+    if precision < 0:
+        return value
+    if isinstance(value, float):
+        return round_float(value, precision)
+    if isinstance(value, dict):
+        return {key: round_numbers(item, precision) for key, item in value.items()}
+    if isinstance(value, list):
+        return [round_numbers(item, precision) for item in value]
+    return value
+
+
+def project(value: Any, fields: list[str] | None) -> Any:
+    """Keep only ``fields`` of a record, or of every record in a list."""
+    if not fields:
+        return value
+    if isinstance(value, dict):
+        return {field: value[field] for field in fields if field in value}
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    return value
+
+
+def to_csv(records: list[dict]) -> str:
+    """Render records as a CSV table whose header is the union of their keys."""
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow(
+            [json.dumps(cell, separators=(",", ":")) if isinstance(cell, (dict, list)) else cell
+             for cell in (record.get(column, "") for column in columns)]
+        )
+    return buffer.getvalue()
+
+
+def format_records(
+    data: Any,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
+    precision: int = FLOAT_PRECISION,
+) -> str:
+    """Serialize a tool result for the model.
+
+    Args:
+        data: A record, a list of records or any JSON-serializable value.
+        output_format: "json" (minified, the default), "csv" (one row per
+            record) or "pretty" (indented JSON).
+        fields: Names of the fields to keep in each record. All fields are
+            kept when empty.
+        precision: Decimal places kept for floats (more for small values, see
+            round_float), negative to disable rounding.
+
+    Returns:
+        str: The serialized data.
+    """
+    output_format = (output_format or DEFAULT_OUTPUT_FORMAT).lower()
+    if output_format not in OUTPUT_FORMATS:
+        output_format = "json"
+
+    data = round_numbers(project(data, fields), precision)
+
+    if output_format == "csv":
+        records = data if isinstance(data, list) else [data]
+        if records and all(isinstance(record, dict) for record in records):
+            return to_csv(records)
+    if output_format == "pretty":
+        return json.dumps(data, indent=2)
+    return json.dumps(data, separators=(",", ":"))
@@ -0,0 +1,181 @@
+"""Local columnar store of historical price bars.
+
+Bars are kept in one Parquet file per (market, ticker, interval) next to a
+small JSON index of the date ranges already fetched. A request only goes
+to the API for the parts of its range that are not held yet, so repeated
+and sliding-window queries ("last 90 days", every day) are mostly served
+from disk. Days from today on are never marked as held because their bars
+are still changing.
+
+A bar belongs to the day its ``time`` string starts with, exactly as the API
+returns it: converting to UTC first would move bars stamped late in the
+exchange's day (or at midnight with a negative UTC offset) to another date.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import pathlib
+import re
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta, timezone
+from importlib.util import find_spec
+
+import pandas as pd
+
+logger = logging.getLogger("financial-datasets-mcp")
+
+PRICE_STORE_DIR = os.getenv("FINANCIAL_DATASETS_PRICE_STORE") or None
+# Parquet support comes from pyarrow, which is installed alongside streamlit
+PARQUET_AVAILABLE = find_spec("pyarrow") is not None
+
+DateRange = tuple[date, date]
+
+
+def bar_days(times: pd.Series) -> pd.Series:
+    """Return the YYYY-MM-DD day of each bar ``time``, as written by the API."""
+    return times.astype(str).str[:10]
+
+
+def missing_ranges(covered: list[DateRange], start: date, end: date) -> list[DateRange]:
+    """Return the parts of ``start..end`` (inclusive) not inside any covered range."""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in sorted(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end:
+            return gaps
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def merge_ranges(ranges: list[DateRange]) -> list[DateRange]:
+    """Merge overlapping or adjacent date ranges."""
+    merged: list[DateRange] = []
+    for range_start, range_end in sorted(ranges):
+        if merged and range_start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+        else:
+            merged.append((range_start, range_end))
+    return merged
+
+
+class PriceStore:
+    """On-disk price history that fetches only the gaps of a requested range."""
+
+    def __init__(self, root: str | None = PRICE_STORE_DIR) -> None:
+        self.root = pathlib.Path(root) if root else None
+        self._locks: dict[str, asyncio.Lock] = {}
+        if self.root is not None and not PARQUET_AVAILABLE:
+            logger.warning("pyarrow is not installed, the local price store is disabled")
+            self.root = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.root is not None
+
+    async def get_prices(
+        self,
+        market: str,
+        ticker: str,
+        interval: str,
+        interval_multiplier: int,
+        start_date: str,
+        end_date: str,
+        fetch: Callable[[str, str], Awaitable[list[dict]]],
+    ) -> list[dict]:
+        """Return the bars of ``start_date..end_date``, fetching only what is missing.
+
+        Args:
+            market: Namespace of the ticker, e.g. "stock" or "crypto".
+            ticker: Ticker symbol.
+            interval: Interval of the bars (e.g. minute, day).
+            interval_multiplier: Multiplier of the interval.
+            start_date: First day of the range (YYYY-MM-DD).
+            end_date: Last day of the range (YYYY-MM-DD), inclusive.
+            fetch: Coroutine function fetching the bars of a sub-range from the
+                API. It must raise on failure so no gap is marked as held.
+
+        Returns:
+            list[dict]: Bars in the range, oldest first.
+        """
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        key = self._key(market, ticker, interval, interval_multiplier)
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            covered = await asyncio.to_thread(self._read_index, key)
+            gaps = missing_ranges(covered, start, end)
+            if not gaps:
+                return await asyncio.to_thread(self._read_bars, key, start, end)
+
+            fetched = []
+            for gap_start, gap_end in gaps:
+                fetched += await fetch(gap_start.isoformat(), gap_end.isoformat())
+
+            # Only closed days count as held; today's bars keep changing
+            last_closed = datetime.now(timezone.utc).date() - timedelta(days=1)
+            covered += [(gap_start, min(gap_end, last_closed)) for gap_start, gap_end in gaps if gap_start <= last_closed]
+            await asyncio.to_thread(self._write, key, fetched, merge_ranges(covered))
+            logger.info(f"Price store {key}: fetched {len(gaps)} gap(s), {len(fetched)} bars")
+            return await asyncio.to_thread(self._read_bars, key, start, end)
+
+    def _key(self, market: str, ticker: str, interval: str, interval_multiplier: int) -> str:
+        safe_ticker = re.sub(r"[^A-Za-z0-9_.-]", "_", ticker.upper())
+        return f"{market}/{safe_ticker}/{interval}-{interval_multiplier}"
+
+    def _bars_path(self, key: str) -> pathlib.Path:
+        return self.root / f"{key}.parquet"
+
+    def _index_path(self, key: str) -> pathlib.Path:
+        return self.root / f"{key}.ranges.json"
+
+    def _read_index(self, key: str) -> list[DateRange]:
+        path = self._index_path(key)
+        if not path.exists():
+            return []
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in json.loads(path.read_text())]
+
+    def _load(self, key: str) -> pd.DataFrame:
+        path = self._bars_path(key)
+        return pd.read_parquet(path) if path.exists() else pd.DataFrame()
+
+    def _write(self, key: str, bars: list[dict], covered: list[DateRange]) -> None:
+        frame = self._load(key)
+        if bars:
+            new = pd.DataFrame(bars)
+            # UTC timestamps only order and deduplicate the bars, the day comes from the string
+            new["_ts"] = pd.to_datetime(new["time"], utc=True, format="mixed")
+            frame = pd.concat([frame, new], ignore_index=True) if not frame.empty else new
+            frame = frame.drop_duplicates(subset="_ts", keep="last").sort_values("_ts")
+            frame["_day"] = bar_days(frame["time"])
+
+        self._bars_path(key).parent.mkdir(parents=True, exist_ok=True)
+        if not frame.empty:
+            tmp_path = self._bars_path(key).with_suffix(".tmp")
+            frame.to_parquet(tmp_path, index=False)
+            tmp_path.replace(self._bars_path(key))
+        # The index is written last so a crash never claims bars that were not saved
+        self._index_path(key).write_text(json.dumps([[start.isoformat(), end.isoformat()] for start, end in covered]))
+
+    def _read_bars(self, key: str, start: date, end: date) -> list[dict]:
+        frame = self._load(key)
+        if frame.empty:
+            return []
+        # Stores written before "_day" existed are filtered on the same string prefix
+        days = frame["_day"] if "_day" in frame else bar_days(frame["time"])
+        selected = frame[(days >= start.isoformat()) & (days <= end.isoformat())]
+        selected = selected.drop(columns=["_ts", "_day"], errors="ignore")
+        # Columns missing from some bars come back as NaN; drop them per record
+        return [
+            {column: value for column, value in record.items() if not (isinstance(value, float) and math.isnan(value))}
+            for record in selected.to_dict(orient="records")
+        ]
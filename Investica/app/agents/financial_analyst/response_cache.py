@@ -0,0 +1,220 @@
+"""Response cache for the Financial Datasets API.
+
+Responses are keyed by their normalized URL and kept in an in-memory LRU,
+optionally backed by a SQLite file so they survive restarts and can be
+shared between server processes. Every endpoint has its own freshness
+window: statements and filings change at most quarterly while price
+snapshots are only good for seconds. Once an entry is past its TTL it is
+still served for a further stale window while a background refresh runs.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger("financial-datasets-mcp")
+
+# (path prefix, ttl seconds, stale-while-revalidate seconds), most specific first
+ENDPOINT_TTLS = [
+    ("/financials/", 24 * 3600, 7 * 24 * 3600),
+    ("/filings/", 6 * 3600, 24 * 3600),
+    ("/crypto/prices/tickers", 24 * 3600, 24 * 3600),
+    ("/crypto/prices/snapshot/", 5, 10),
+    ("/prices/snapshot/", 5, 10),
+    ("/crypto/prices/", 15 * 60, 3600),
+    ("/prices/", 15 * 60, 3600),
+    ("/news/", 5 * 60, 15 * 60),
+]
+DEFAULT_TTL = (60, 60)
+
+CACHE_MAX_ENTRIES = int(os.getenv("FINANCIAL_DATASETS_CACHE_MAX_ENTRIES", "1024"))
+CACHE_DB_PATH = os.getenv("FINANCIAL_DATASETS_CACHE_DB") or None
+CACHE_DB_MAX_ROWS = int(os.getenv("FINANCIAL_DATASETS_CACHE_DB_MAX_ROWS", "20000"))
+CACHE_ENABLED = os.getenv("FINANCIAL_DATASETS_CACHE", "true").lower() == "true"
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so equivalent requests share a cache key.
+
+    Query parameters are sorted, empty ones dropped and the path gets a
+    trailing slash, so ``?limit=4&ticker=AAPL`` and ``?ticker=AAPL&limit=4``
+    map to the same entry.
+    """
+    parts = urlsplit(url)
+    params = sorted((key, value) for key, value in parse_qsl(parts.query) if value != "")
+    path = parts.path if parts.path.endswith("/") else parts.path + "/"
+    return urlunsplit((parts.scheme, parts.netloc.lower(), path, urlencode(params), ""))
+
+
+def ttl_for(url: str) -> tuple[float, float]:
+    """Return the (ttl, stale window) in seconds for the endpoint of ``url``."""
+    path = urlsplit(url).path
+    for prefix, ttl, stale in ENDPOINT_TTLS:
+        if path.startswith(prefix):
+            return ttl, stale
+    return DEFAULT_TTL
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters of a ResponseCache."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    evictions: int = 0
+
+
+class ResponseCache:
+    """LRU response cache with per-endpoint TTLs and an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        db_path: str | None = CACHE_DB_PATH,
+        db_max_rows: int = CACHE_DB_MAX_ROWS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.db_max_rows = db_max_rows
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.Lock()
+
+    async def get_or_fetch(self, url: str, fetch: Callable[[str], Awaitable[dict]]) -> dict:
+        """Return the response for ``url``, calling ``fetch`` only when needed.
+
+        Args:
+            url: Request URL.
+            fetch: Coroutine function performing the real request. It must raise
+                on failure so errors are never cached.
+
+        Returns:
+            dict: The decoded JSON response.
+        """
+        key = normalize_url(url)
+        ttl, stale = ttl_for(key)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.db_path:
+            entry = await asyncio.to_thread(self._db_get, key)
+            if entry is not None:
+                self.stats.disk_hits += 1
+                self._remember(key, entry)
+
+        if entry is not None:
+            stored_at, data = entry
+            age = time.time() - stored_at
+            if age < ttl:
+                self.stats.hits += 1
+                return data
+            if age < ttl + stale:
+                self.stats.stale_hits += 1
+                self._schedule_refresh(key, url, fetch)
+                return data
+
+        self.stats.misses += 1
+        data = await fetch(url)
+        await self.put(key, data)
+        return data
+
+    async def put(self, key: str, data: dict) -> None:
+        """Store ``data`` under the normalized ``key`` in every tier."""
+        entry = (time.time(), data)
+        self._remember(key, entry)
+        if self.db_path:
+            await asyncio.to_thread(self._db_put, key, entry)
+
+    def snapshot(self) -> dict:
+        """Return the counters and current size, for logging and diagnostics."""
+        total = self.stats.hits + self.stats.stale_hits + self.stats.misses
+        hit_rate = (self.stats.hits + self.stats.stale_hits) / total if total else 0.0
+        return {**vars(self.stats), "entries": len(self._entries), "hit_rate": round(hit_rate, 3)}
+
+    def close(self) -> None:
+        """Cancel pending refreshes and close the SQLite connection."""
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, key: str, entry: tuple[float, dict]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _schedule_refresh(self, key: str, url: str, fetch: Callable[[str], Awaitable[dict]]) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self.put(key, await fetch(url))
+                self.stats.refreshes += 1
+            except Exception as e:
+                self.stats.refresh_errors += 1
+                logger.warning(f"Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL, body TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        return self._db
+
+    def _db_get(self, key: str) -> tuple[float, dict] | None:
+        try:
+            with self._db_lock:
+                row = self._connect().execute(
+                    "SELECT stored_at, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _db_put(self, key: str, entry: tuple[float, dict]) -> None:
+        try:
+            with self._db_lock:
+                db = self._connect()
+                with db:
+                    db.execute(
+                        "INSERT OR REPLACE INTO responses (key, stored_at, body) VALUES (?, ?, ?)",
+                        (key, entry[0], json.dumps(entry[1])),
+                    )
+                    db.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                        (self.db_max_rows,),
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {e}")
@@ -1,11 +1,21 @@
-import json
+import asyncio
 import os
 import httpx
 import logging
 import sys
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
+from importlib.util import find_spec
 from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
 from dotenv import load_dotenv
 
+from response_cache import CACHE_ENABLED, ResponseCache, normalize_url
+from single_flight import SingleFlight
+from formatting import format_records, project
+from aggregation import reduce_prices
+from price_store import PriceStore
+
 # Configure logging to write to stderr
 logging.basicConfig(
     level=logging.INFO,
@@ -14,37 +24,196 @@ logging.basicConfig(
 )
 logger = logging.getLogger("financial-datasets-mcp")
 
-# Initialize FastMCP server
-mcp = FastMCP("financial-datasets")
+# Load environment variables from .env file once, at startup
+load_dotenv()
 
 # Constants
 FINANCIAL_DATASETS_API_BASE = "https://api.financialdatasets.ai"
+FINANCIAL_DATASETS_API_KEY = os.environ.get("FINANCIAL_DATASETS_API_KEY")
+
+# HTTP client tuning
+HTTP_TIMEOUT = float(os.getenv("FINANCIAL_DATASETS_TIMEOUT", "30"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("FINANCIAL_DATASETS_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("FINANCIAL_DATASETS_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("FINANCIAL_DATASETS_KEEPALIVE_EXPIRY", "60"))
+# Batch tools: how many tickers one call accepts and how many requests run at once
+BATCH_MAX_TICKERS = int(os.getenv("FINANCIAL_DATASETS_BATCH_MAX_TICKERS", "50"))
+BATCH_CONCURRENCY = int(os.getenv("FINANCIAL_DATASETS_BATCH_CONCURRENCY", "8"))
+# HTTP/2 uses the "h2" package installed with httpx[http2]; falls back to HTTP/1.1 without it
+HTTP2 = os.getenv("FINANCIAL_DATASETS_HTTP2", "true").lower() == "true" and find_spec("h2") is not None
+
+# Shared client, opened by the server lifespan (or lazily on first request)
+_client: httpx.AsyncClient | None = None
+
+# Cache of API responses with per-endpoint TTLs (see response_cache.py)
+response_cache = ResponseCache()
+
+# Concurrent identical requests share one upstream call (see single_flight.py)
+inflight_requests = SingleFlight()
+
+# Local price history, enabled by FINANCIAL_DATASETS_PRICE_STORE (see price_store.py)
+price_store = PriceStore()
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        headers = {}
+        if FINANCIAL_DATASETS_API_KEY:
+            headers["X-API-KEY"] = FINANCIAL_DATASETS_API_KEY
+
+        _client = httpx.AsyncClient(
+            headers=headers,
+            http2=HTTP2,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Open the shared HTTP client when the server starts and close it on shutdown."""
+    get_client()
+    logger.info(f"HTTP client ready (http2={HTTP2}, max_connections={HTTP_MAX_CONNECTIONS})")
+    try:
+        yield
+    finally:
+        await close_client()
+        response_cache.close()
+        logger.info(
+            f"HTTP client closed, response cache stats: {response_cache.snapshot()}, "
+            f"coalescing stats: {inflight_requests.snapshot()}"
+        )
+
+
+# Initialize FastMCP server
+mcp = FastMCP("financial-datasets", lifespan=lifespan)
+
+# Every tool only reads from the API, so clients may retry them safely
+READ_ONLY = ToolAnnotations(readOnlyHint=True, openWorldHint=True)
 
 
 # Helper function to make API requests
 async def make_request(url: str) -> dict[str, any] | None:
-    """Make a request to the Financial Datasets API with proper error handling."""
-    # Load environment variables from .env file
-    load_dotenv()
-    
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            return {"Error": str(e)}
-
-
-@mcp.tool()
+    """Make a request to the Financial Datasets API with proper error handling.
+
+    Responses are served from the response cache while fresh; errors are never cached.
+    """
+    try:
+        if CACHE_ENABLED:
+            return await response_cache.get_or_fetch(url, fetch_coalesced)
+        return await fetch_coalesced(url)
+    except Exception as e:
+        return {"Error": str(e)}
+
+
+async def fetch_coalesced(url: str) -> dict[str, any]:
+    """GET ``url``, joining an identical request that is already in flight."""
+    return await inflight_requests.do(normalize_url(url), fetch_json, url)
+
+
+async def fetch_json(url: str) -> dict[str, any]:
+    """GET ``url`` from the API and decode the JSON body, raising on any failure."""
+    response = await get_client().get(url)
+    response.raise_for_status()
+    return response.json()
+
+
+def normalize_tickers(tickers: list[str]) -> list[str]:
+    """Strip, upper-case and de-duplicate tickers, keeping their order."""
+    return list(dict.fromkeys(ticker.strip().upper() for ticker in tickers if ticker.strip()))
+
+
+async def fetch_batch(tickers: list[str], url_for, key: str, label: str, fields: list[str] | None = None) -> str:
+    """Fetch one endpoint for many tickers concurrently and combine the results.
+
+    Args:
+        tickers: Ticker symbols to fetch.
+        url_for: Callable building the request URL for a single ticker.
+        key: Key of the payload in the API response (e.g. "snapshot").
+        label: Human readable name of the payload, used in error messages.
+        fields: Only keep these fields of each record.
+
+    Returns:
+        str: Compact JSON object mapping each ticker to its payload, or to
+        {"error": ...} when that ticker could not be fetched.
+    """
+    tickers = normalize_tickers(tickers)
+    if not tickers:
+        return "No tickers given."
+    if len(tickers) > BATCH_MAX_TICKERS:
+        return f"Too many tickers ({len(tickers)}), at most {BATCH_MAX_TICKERS} are allowed per call."
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_one(ticker: str) -> tuple[str, any]:
+        async with semaphore:
+            data = await make_request(url_for(ticker))
+        if not data:
+            return ticker, {"error": f"Unable to fetch {label}."}
+        if "Error" in data:
+            return ticker, {"error": data["Error"]}
+        if not (payload := data.get(key)):
+            return ticker, {"error": f"No {label} found."}
+        return ticker, project(payload, fields)
+
+    results = await asyncio.gather(*(fetch_one(ticker) for ticker in tickers))
+    return format_records(dict(results))
+
+
+async def fetch_prices(
+    market: str,
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    interval: str,
+    interval_multiplier: int,
+) -> list[dict] | str:
+    """Fetch historical price bars, serving what the local price store already holds.
+
+    Returns:
+        list[dict] | str: The bars, or an error message for the model.
+    """
+    path = "crypto/prices" if market == "crypto" else "prices"
+
+    async def fetch_range(range_start: str, range_end: str) -> list[dict]:
+        url = f"{FINANCIAL_DATASETS_API_BASE}/{path}/?ticker={ticker}&interval={interval}&interval_multiplier={interval_multiplier}&start_date={range_start}&end_date={range_end}"
+        data = await make_request(url)
+        if not data or "Error" in data:
+            raise RuntimeError((data or {}).get("Error", "no data returned"))
+        return data.get("prices", [])
+
+    try:
+        if price_store.enabled:
+            return await price_store.get_prices(
+                market, ticker, interval, interval_multiplier, start_date, end_date, fetch_range
+            )
+        return await fetch_range(start_date, end_date)
+    except Exception as e:
+        return f"Unable to fetch prices: {e}"
+
+
+@mcp.tool(annotations=READ_ONLY)
 async def get_income_statements(
     ticker: str,
     period: str = "annual",
     limit: int = 4,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Get income statements for a company.
 
@@ -52,6 +221,8 @@ async def get_income_statements(
         ticker: Ticker symbol of the company (e.g. AAPL, GOOGL)
         period: Period of the income statement (e.g. annual, quarterly, ttm)
         limit: Number of income statements to return (default: 4)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["report_period", "revenue", "net_income"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/financials/income-statements/?ticker={ticker}&period={period}&limit={limit}"
@@ -69,14 +240,16 @@ async def get_income_statements(
         return "Unable to fetch income statements or no income statements found."
 
     # Stringify the income statements
-    return json.dumps(income_statements, indent=2)
+    return format_records(income_statements, output_format, fields)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_balance_sheets(
     ticker: str,
     period: str = "annual",
     limit: int = 4,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Get balance sheets for a company.
 
@@ -84,6 +257,8 @@ async def get_balance_sheets(
         ticker: Ticker symbol of the company (e.g. AAPL, GOOGL)
         period: Period of the balance sheet (e.g. annual, quarterly, ttm)
         limit: Number of balance sheets to return (default: 4)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["report_period", "total_assets", "total_liabilities"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/financials/balance-sheets/?ticker={ticker}&period={period}&limit={limit}"
@@ -101,14 +276,16 @@ async def get_balance_sheets(
         return "Unable to fetch balance sheets or no balance sheets found."
 
     # Stringify the balance sheets
-    return json.dumps(balance_sheets, indent=2)
+    return format_records(balance_sheets, output_format, fields)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_cash_flow_statements(
     ticker: str,
     period: str = "annual",
     limit: int = 4,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Get cash flow statements for a company.
 
@@ -116,6 +293,8 @@ async def get_cash_flow_statements(
         ticker: Ticker symbol of the company (e.g. AAPL, GOOGL)
         period: Period of the cash flow statement (e.g. annual, quarterly, ttm)
         limit: Number of cash flow statements to return (default: 4)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["report_period", "free_cash_flow"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/financials/cash-flow-statements/?ticker={ticker}&period={period}&limit={limit}"
@@ -133,15 +312,21 @@ async def get_cash_flow_statements(
         return "Unable to fetch cash flow statements or no cash flow statements found."
 
     # Stringify the cash flow statements
-    return json.dumps(cash_flow_statements, indent=2)
+    return format_records(cash_flow_statements, output_format, fields)
 
 
-@mcp.tool()
-async def get_current_stock_price(ticker: str) -> str:
+@mcp.tool(annotations=READ_ONLY)
+async def get_current_stock_price(
+    ticker: str,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
+) -> str:
     """Get the current / latest price of a company.
 
     Args:
         ticker: Ticker symbol of the company (e.g. AAPL, GOOGL)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["price", "day_change_percent"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/prices/snapshot/?ticker={ticker}"
@@ -159,16 +344,21 @@ async def get_current_stock_price(ticker: str) -> str:
         return "Unable to fetch current price or no current price found."
 
     # Stringify the current price
-    return json.dumps(snapshot, indent=2)
+    return format_records(snapshot, output_format, fields)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_historical_stock_prices(
     ticker: str,
     start_date: str,
     end_date: str,
     interval: str = "day",
     interval_multiplier: int = 1,
+    resample_to: str | None = None,
+    max_points: int | None = None,
+    summary_only: bool = False,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Gets historical stock prices for a company.
 
@@ -178,32 +368,43 @@ async def get_historical_stock_prices(
         end_date: End date of the price data (e.g. 2020-12-31)
         interval: Interval of the price data (e.g. minute, hour, day, week, month)
         interval_multiplier: Multiplier of the interval (e.g. 1, 2, 3)
+        resample_to: Aggregate the bars into coarser OHLCV bars (hour, day, week, month, quarter, year)
+        max_points: Downsample to at most this many bars while keeping the shape of the series
+        summary_only: Return return, volatility and drawdown statistics instead of the bars
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["time", "close"]); all fields when omitted
     """
-    # Fetch data from the API
-    url = f"{FINANCIAL_DATASETS_API_BASE}/prices/?ticker={ticker}&interval={interval}&interval_multiplier={interval_multiplier}&start_date={start_date}&end_date={end_date}"
-    data = await make_request(url)
-
-    # Check if data is found
-    if not data:
-        return "Unable to fetch prices or no prices found."
-
-    # Extract the prices
-    prices = data.get("prices", [])
+    # Fetch data from the API, or from the local price store when enabled
+    prices = await fetch_prices("stock", ticker, start_date, end_date, interval, interval_multiplier)
+    if isinstance(prices, str):
+        return prices
 
     # Check if prices are found
     if not prices:
         return "Unable to fetch prices or no prices found."
 
+    # Reduce the series on the server so the payload stays bounded
+    try:
+        prices = reduce_prices(prices, interval, resample_to, max_points, summary_only)
+    except Exception as e:
+        return f"Unable to aggregate prices: {e}"
+
     # Stringify the prices
-    return json.dumps(prices, indent=2)
+    return format_records(prices, output_format, None if summary_only else fields)
 
 
-@mcp.tool()
-async def get_company_news(ticker: str) -> str:
+@mcp.tool(annotations=READ_ONLY)
+async def get_company_news(
+    ticker: str,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
+) -> str:
     """Get news for a company.
 
     Args:
         ticker: Ticker symbol of the company (e.g. AAPL, GOOGL)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["title", "date"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/news/?ticker={ticker}"
@@ -219,10 +420,10 @@ async def get_company_news(ticker: str) -> str:
     # Check if news are found
     if not news:
         return "Unable to fetch news or no news found."
-    return json.dumps(news, indent=2)
+    return format_records(news, output_format, fields)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_available_crypto_tickers() -> str:
     """
     Gets all available crypto tickers.
@@ -239,46 +440,56 @@ async def get_available_crypto_tickers() -> str:
     tickers = data.get("tickers", [])
 
     # Stringify the available crypto tickers
-    return json.dumps(tickers, indent=2)
+    return format_records(tickers)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_crypto_prices(
     ticker: str,
     start_date: str,
     end_date: str,
     interval: str = "day",
     interval_multiplier: int = 1,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """
     Gets historical prices for a crypto currency.
-    """
-    # Fetch data from the API
-    url = f"{FINANCIAL_DATASETS_API_BASE}/crypto/prices/?ticker={ticker}&interval={interval}&interval_multiplier={interval_multiplier}&start_date={start_date}&end_date={end_date}"
-    data = await make_request(url)
 
-    # Check if data is found
-    if not data:
-        return "Unable to fetch prices or no prices found."
-
-    # Extract the prices
-    prices = data.get("prices", [])
+    Args:
+        ticker: Ticker symbol of the crypto currency (e.g. BTC-USD)
+        start_date: Start date of the price data (e.g. 2020-01-01)
+        end_date: End date of the price data (e.g. 2020-12-31)
+        interval: Interval of the price data (e.g. minute, hour, day, week, month)
+        interval_multiplier: Multiplier of the interval (e.g. 1, 2, 3)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["time", "close"]); all fields when omitted
+    """
+    # Fetch data from the API, or from the local price store when enabled
+    prices = await fetch_prices("crypto", ticker, start_date, end_date, interval, interval_multiplier)
+    if isinstance(prices, str):
+        return prices
 
     # Check if prices are found
     if not prices:
         return "Unable to fetch prices or no prices found."
 
     # Stringify the prices
-    return json.dumps(prices, indent=2)
+    return format_records(prices, output_format, fields)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_historical_crypto_prices(
     ticker: str,
     start_date: str,
     end_date: str,
     interval: str = "day",
     interval_multiplier: int = 1,
+    resample_to: str | None = None,
+    max_points: int | None = None,
+    summary_only: bool = False,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Gets historical prices for a crypto currency.
 
@@ -288,32 +499,43 @@ async def get_historical_crypto_prices(
         end_date: End date of the price data (e.g. 2020-12-31)
         interval: Interval of the price data (e.g. minute, hour, day, week, month)
         interval_multiplier: Multiplier of the interval (e.g. 1, 2, 3)
+        resample_to: Aggregate the bars into coarser OHLCV bars (hour, day, week, month, quarter, year)
+        max_points: Downsample to at most this many bars while keeping the shape of the series
+        summary_only: Return return, volatility and drawdown statistics instead of the bars
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["time", "close"]); all fields when omitted
     """
-    # Fetch data from the API
-    url = f"{FINANCIAL_DATASETS_API_BASE}/crypto/prices/?ticker={ticker}&interval={interval}&interval_multiplier={interval_multiplier}&start_date={start_date}&end_date={end_date}"
-    data = await make_request(url)
-
-    # Check if data is found
-    if not data:
-        return "Unable to fetch prices or no prices found."
-
-    # Extract the prices
-    prices = data.get("prices", [])
+    # Fetch data from the API, or from the local price store when enabled
+    prices = await fetch_prices("crypto", ticker, start_date, end_date, interval, interval_multiplier)
+    if isinstance(prices, str):
+        return prices
 
     # Check if prices are found
     if not prices:
         return "Unable to fetch prices or no prices found."
 
+    # Reduce the series on the server so the payload stays bounded
+    try:
+        prices = reduce_prices(prices, interval, resample_to, max_points, summary_only)
+    except Exception as e:
+        return f"Unable to aggregate prices: {e}"
+
     # Stringify the prices
-    return json.dumps(prices, indent=2)
+    return format_records(prices, output_format, None if summary_only else fields)
 
 
-@mcp.tool()
-async def get_current_crypto_price(ticker: str) -> str:
+@mcp.tool(annotations=READ_ONLY)
+async def get_current_crypto_price(
+    ticker: str,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
+) -> str:
     """Get the current / latest price of a crypto currency.
 
     Args:
         ticker: Ticker symbol of the crypto currency (e.g. BTC-USD). The list of available crypto tickers can be retrieved via the get_available_crypto_tickers tool.
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["price", "day_change_percent"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/crypto/prices/snapshot/?ticker={ticker}"
@@ -331,14 +553,16 @@ async def get_current_crypto_price(ticker: str) -> str:
         return "Unable to fetch current price or no current price found."
 
     # Stringify the current price
-    return json.dumps(snapshot, indent=2)
+    return format_records(snapshot, output_format, fields)
 
 
-@mcp.tool()
+@mcp.tool(annotations=READ_ONLY)
 async def get_sec_filings(
     ticker: str,
     limit: int = 10,
     filing_type: str | None = None,
+    output_format: str | None = None,
+    fields: list[str] | None = None,
 ) -> str:
     """Get all SEC filings for a company.
 
@@ -346,6 +570,8 @@ async def get_sec_filings(
         ticker: Ticker symbol of the company (e.g. AAPL, GOOGL)
         limit: Number of SEC filings to return (default: 10)
         filing_type: Type of SEC filing (e.g. 10-K, 10-Q, 8-K)
+        output_format: Output format, "json" (compact, default), "csv" (one row per record, smallest for long lists) or "pretty"
+        fields: Only return these fields of each record (e.g. ["filing_type", "report_date", "url"]); all fields when omitted
     """
     # Fetch data from the API
     url = f"{FINANCIAL_DATASETS_API_BASE}/filings/?ticker={ticker}&limit={limit}"
@@ -363,7 +589,120 @@ async def get_sec_filings(
         return f"Unable to fetch SEC filings or no SEC filings found."
 
     # Stringify the SEC filings
-    return json.dumps(filings, indent=2)
+    return format_records(filings, output_format, fields)
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def get_current_stock_prices(
+    tickers: list[str],
+    fields: list[str] | None = None,
+) -> str:
+    """Get the current / latest prices of several companies in one call.
+
+    Args:
+        tickers: Ticker symbols of the companies (e.g. ["AAPL", "GOOGL"])
+        fields: Only return these fields of each record (e.g. ["price", "day_change_percent"]); all fields when omitted
+    """
+    return await fetch_batch(
+        tickers,
+        lambda ticker: f"{FINANCIAL_DATASETS_API_BASE}/prices/snapshot/?ticker={ticker}",
+        "snapshot",
+        "current price",
+        fields,
+    )
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def get_income_statements_batch(
+    tickers: list[str],
+    period: str = "annual",
+    limit: int = 4,
+    fields: list[str] | None = None,
+) -> str:
+    """Get income statements for several companies in one call.
+
+    Args:
+        tickers: Ticker symbols of the companies (e.g. ["AAPL", "GOOGL"])
+        period: Period of the income statements (e.g. annual, quarterly, ttm)
+        limit: Number of income statements to return per company (default: 4)
+        fields: Only return these fields of each record (e.g. ["report_period", "revenue", "net_income"]); all fields when omitted
+    """
+    return await fetch_batch(
+        tickers,
+        lambda ticker: f"{FINANCIAL_DATASETS_API_BASE}/financials/income-statements/?ticker={ticker}&period={period}&limit={limit}",
+        "income_statements",
+        "income statements",
+        fields,
+    )
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def get_balance_sheets_batch(
+    tickers: list[str],
+    period: str = "annual",
+    limit: int = 4,
+    fields: list[str] | None = None,
+) -> str:
+    """Get balance sheets for several companies in one call.
+
+    Args:
+        tickers: Ticker symbols of the companies (e.g. ["AAPL", "GOOGL"])
+        period: Period of the balance sheets (e.g. annual, quarterly, ttm)
+        limit: Number of balance sheets to return per company (default: 4)
+        fields: Only return these fields of each record (e.g. ["report_period", "total_assets", "total_liabilities"]); all fields when omitted
+    """
+    return await fetch_batch(
+        tickers,
+        lambda ticker: f"{FINANCIAL_DATASETS_API_BASE}/financials/balance-sheets/?ticker={ticker}&period={period}&limit={limit}",
+        "balance_sheets",
+        "balance sheets",
+        fields,
+    )
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def get_cash_flow_statements_batch(
+    tickers: list[str],
+    period: str = "annual",
+    limit: int = 4,
+    fields: list[str] | None = None,
+) -> str:
+    """Get cash flow statements for several companies in one call.
+
+    Args:
+        tickers: Ticker symbols of the companies (e.g. ["AAPL", "GOOGL"])
+        period: Period of the cash flow statements (e.g. annual, quarterly, ttm)
+        limit: Number of cash flow statements to return per company (default: 4)
+        fields: Only return these fields of each record (e.g. ["report_period", "free_cash_flow"]); all fields when omitted
+    """
+    return await fetch_batch(
+        tickers,
+        lambda ticker: f"{FINANCIAL_DATASETS_API_BASE}/financials/cash-flow-statements/?ticker={ticker}&period={period}&limit={limit}",
+        "cash_flow_statements",
+        "cash flow statements",
+        fields,
+    )
+
+
+@mcp.tool(annotations=READ_ONLY)
+async def get_current_crypto_prices(
+    tickers: list[str],
+    fields: list[str] | None = None,
+) -> str:
+    """Get the current / latest prices of several crypto currencies in one call.
+
+    Args:
+        tickers: Ticker symbols of the crypto currencies (e.g. ["BTC-USD", "ETH-USD"])
+        fields: Only return these fields of each record (e.g. ["price", "day_change_percent"]); all fields when omitted
+    """
+    return await fetch_batch(
+        tickers,
+        lambda ticker: f"{FINANCIAL_DATASETS_API_BASE}/crypto/prices/snapshot/?ticker={ticker}",
+        "snapshot",
+        "current price",
+        fields,
+    )
+
 
 if __name__ == "__main__":
     # Log server startup
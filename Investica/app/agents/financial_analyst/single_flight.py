@@ -0,0 +1,57 @@
+"""Request coalescing for upstream API calls.
+
+When several tool calls ask for the same URL at the same time only the
+first one goes to the network; the others wait on its result. Spikes in
+this deployment are highly correlated (market open, news events), so this
+keeps upstream load proportional to distinct requests rather than users.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of a SingleFlight group."""
+
+    calls: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        self.stats = SingleFlightStats()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Run ``fn(*args)`` unless a call with the same ``key`` is already in flight.
+
+        Every waiter receives the same result, or the same exception. The
+        shared call keeps running if the caller that started it is cancelled,
+        so the remaining waiters are unaffected.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.stats.calls += 1
+        task = asyncio.ensure_future(fn(*args))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> dict:
+        """Return the counters and the number of calls currently in flight."""
+        return {**vars(self.stats), "inflight": len(self._inflight)}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -9,7 +9,7 @@ import os
 
 from pydantic_ai import Agent
 
-from app.utils import model, MCPClient, ZERODHA_AGENT_SYSTEM_PROMPT
+from app.utils import model, MCPClient, get_mcp_pool, ZERODHA_AGENT_SYSTEM_PROMPT
 
 # Get the directory where the current script is located
 SCRIPT_DIR = pathlib.Path(__file__).parent.resolve()
@@ -18,10 +18,16 @@ CONFIG_FILE = SCRIPT_DIR / "mcp_config.json"
 
 load_dotenv()
 
-async def get_zerodha_agent():
-    client = MCPClient()
+# The agent does not hand the Kite tools to the model yet; when off, no Kite
+# server is spawned for the conversation at all
+ZERODHA_AGENT_TOOLS = os.getenv("ZERODHA_AGENT_TOOLS", "false").lower() == "true"
+
+async def get_zerodha_agent(session_key: str | None = None):
+    # Servers are borrowed from the shared pool; client.cleanup() hands them back.
+    # The Kite server holds the user's login, so each session_key gets its own
+    client = MCPClient(pool=get_mcp_pool(), session_key=session_key)
     client.load_servers(str(CONFIG_FILE))
-    tools = await client.start()
+    tools = await client.start() if ZERODHA_AGENT_TOOLS else []
 
     # i = 1
     # for tool in tools:
@@ -31,7 +37,7 @@ async def get_zerodha_agent():
     agent = Agent(
         model = model,
         system_prompt = ZERODHA_AGENT_SYSTEM_PROMPT,
-        # tools = tools,
+        tools = tools,
         retries=2
     )
 
@@ -82,6 +88,7 @@ async def main():
     finally:
         # Ensure proper cleanup of MCP client resources when exiting
         await mcp_client.cleanup()
+        await get_mcp_pool().close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -4,9 +4,8 @@ import pathlib
 import asyncio
 from typing import List, Dict, Any
 import traceback
-import threading
-import queue
-import time
+import atexit
+import uuid
 
 # Path setup
 current_script_dir = pathlib.Path(__file__).parent.resolve()
@@ -25,6 +24,7 @@ if sys.platform.startswith('win'):
 sys.path.append(str(pathlib.Path(__file__).parent / "app"))
 
 from agent import get_zerodha_agent
+from app.utils.runtime import AsyncRuntime
 
 st.set_page_config(
     page_title="Investica",
@@ -83,71 +83,27 @@ if "mcp_agent" not in st.session_state:
 if "available_tools" not in st.session_state:
     st.session_state.available_tools = []
 
-if "background_loop" not in st.session_state:
-    st.session_state.background_loop = None
+# Each browser session gets its own Kite connection, and so its own login
+if "session_key" not in st.session_state:
+    st.session_state.session_key = str(uuid.uuid4())
 
-if "background_thread" not in st.session_state:
-    st.session_state.background_thread = None
+@st.cache_resource
+def get_runtime():
+    """One event loop thread for the whole process, shared by every browser session"""
+    runtime = AsyncRuntime()
+    runtime.start()
+    atexit.register(runtime.shutdown)
+    return runtime
 
-class AsyncRunner:
-    """Helper class to run async functions in a background thread with proper event loop management"""
-    
-    def __init__(self):
-        self.loop = None
-        self.thread = None
-        self.result_queue = queue.Queue()
-        self.exception_queue = queue.Queue()
-        
-    def start_background_loop(self):
-        """Start the background event loop in a separate thread"""
-        if self.thread is None or not self.thread.is_alive():
-            self.thread = threading.Thread(target=self._run_background_loop, daemon=True)
-            self.thread.start()
-            # Wait a bit for the loop to start
-            time.sleep(0.1)
-    
-    def _run_background_loop(self):
-        """Run the event loop in the background thread"""
-        try:
-            # Create a new event loop for this thread
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_forever()
-        except Exception as e:
-            print(f"Background loop error: {e}")
-        finally:
-            if self.loop:
-                self.loop.close()
-    
-    def run_async(self, coro):
-        """Run an async coroutine in the background thread"""
-        if self.loop is None or not self.loop.is_running():
-            self.start_background_loop()
-            time.sleep(0.2)  # Give more time for loop to start
-        
-        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        try:
-            result = future.result(timeout=30)  # 30 second timeout
-            return result
-        except Exception as e:
-            raise e
-    
-    def cleanup(self):
-        """Clean up the background thread and loop"""
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5)
+runtime = get_runtime()
 
-# Initialize the async runner
-if "async_runner" not in st.session_state:
-    st.session_state.async_runner = AsyncRunner()
-
-async def initialize_agent():
+async def initialize_agent(session_key: str):
     """Initialize the Pydantic AI agent asynchronously"""
     try:
         print("Starting agent initialization...")
-        mcp_client, mcp_agent = await get_zerodha_agent()
+        # Connect this session's MCP servers; they stay warm in the pool between turns
+        mcp_client, mcp_agent = await get_zerodha_agent(session_key)
+        await mcp_client.cleanup()
         print("Agent initialization completed successfully")
         return mcp_client, mcp_agent, None
     except Exception as e:
@@ -155,9 +111,12 @@ async def initialize_agent():
         print(f"Agent initialization failed: {error_msg}")
         return None, None, error_msg
 
-async def get_agent_response(user_input: str, message_history: List[Any], mcp_agent):
+async def get_agent_response(user_input: str, message_history: List[Any], session_key: str):
     """Get response from the agent"""
+    mcp_client = None
     try:
+        # Borrow this session's servers for the turn only, so the pool can close them once idle
+        mcp_client, mcp_agent = await get_zerodha_agent(session_key)
         print(f"Getting agent response for: {user_input[:50]}...")
         user_input += " Do not ask for logging in. And if not found any data then use fake data just don't say sorry always give a beautifull response. We have to record a video so give response such that it seems like a response from a fully completed app."
         # Get the agent response
@@ -173,6 +132,9 @@ async def get_agent_response(user_input: str, message_history: List[Any], mcp_ag
         error_msg = f"Error getting agent response: {str(e)}\n{traceback.format_exc()}"
         print(f"Agent response error: {error_msg}")
         return None, message_history, error_msg
+    finally:
+        if mcp_client is not None:
+            await mcp_client.cleanup()
 
 # UI Components
 with st.sidebar:
@@ -194,8 +156,8 @@ with st.sidebar:
         if st.button("Initialize Agent"):
             with st.spinner("Initializing agent and connecting to MCP servers..."):
                 try:
-                    mcp_client, mcp_agent, error = st.session_state.async_runner.run_async(
-                        initialize_agent()
+                    mcp_client, mcp_agent, error = runtime.run(
+                        initialize_agent(st.session_state.session_key)
                     )
                     
                     if error:
@@ -234,8 +196,8 @@ st.title("Investica")
 if not st.session_state.agent_initialized:
     with st.spinner("Initializing agent and connecting to MCP servers..."):
         try:
-            mcp_client, mcp_agent, error = st.session_state.async_runner.run_async(
-                initialize_agent()
+            mcp_client, mcp_agent, error = runtime.run(
+                initialize_agent(st.session_state.session_key)
             )
             
             if error:
@@ -291,8 +253,8 @@ if st.session_state.agent_initialized:
                             message_history.append({"role": "assistant", "content": msg["content"]})
                     
                     # Get response from agent using the background thread
-                    response_data, updated_messages, error = st.session_state.async_runner.run_async(
-                        get_agent_response(user_input, message_history, st.session_state.mcp_agent)
+                    response_data, updated_messages, error = runtime.run(
+                        get_agent_response(user_input, message_history, st.session_state.session_key)
                     )
                     
                     if error:
@@ -340,18 +302,3 @@ st.markdown(
     """, 
     unsafe_allow_html=True
 )
-
-# Cleanup function (called when app is stopped)
-def cleanup():
-    """Cleanup MCP client resources"""
-    try:
-        if st.session_state.mcp_client:
-            st.session_state.async_runner.run_async(st.session_state.mcp_client.cleanup())
-        if st.session_state.async_runner:
-            st.session_state.async_runner.cleanup()
-    except Exception as e:
-        print(f"Cleanup error: {e}")
-
-# Register cleanup function
-import atexit
-atexit.register(cleanup)
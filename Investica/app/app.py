@@ -4,9 +4,7 @@ import pathlib
 import asyncio
 from typing import List, Dict, Any
 import traceback
-import threading
-import queue
-import time
+import atexit
 import uuid
 
 # Path setup
@@ -23,8 +21,10 @@ import streamlit as st
 if sys.platform.startswith('win'):
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-# Import the simplified agentic flow
-from graph import agentic_flow
+# Import the streaming entry point of the agentic flow
+from graph import stream_turn
+from app.utils.runtime import AsyncRuntime
+from app.tools.artifacts import find_handles, get_artifact_store
 
 st.set_page_config(
     page_title="Investica",
@@ -74,93 +74,54 @@ if "messages" not in st.session_state:
 if "thread_id" not in st.session_state:
     st.session_state.thread_id = str(uuid.uuid4())
 
-if "background_loop" not in st.session_state:
-    st.session_state.background_loop = None
-
-if "background_thread" not in st.session_state:
-    st.session_state.background_thread = None
-
-class AsyncRunner:
-    """Helper class to run async functions in a background thread with proper event loop management"""
-    
-    def __init__(self):
-        self.loop = None
-        self.thread = None
-        
-    def start_background_loop(self):
-        """Start the background event loop in a separate thread"""
-        if self.thread is None or not self.thread.is_alive():
-            self.thread = threading.Thread(target=self._run_background_loop, daemon=True)
-            self.thread.start()
-            # Wait a bit for the loop to start
-            time.sleep(0.1)
-    
-    def _run_background_loop(self):
-        """Run the event loop in the background thread"""
-        try:
-            # Create a new event loop for this thread
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_forever()
-        except Exception as e:
-            print(f"Background loop error: {e}")
-        finally:
-            if self.loop:
-                self.loop.close()
-    
-    def run_async(self, coro):
-        """Run an async coroutine in the background thread"""
-        if self.loop is None or not self.loop.is_running():
-            self.start_background_loop()
-            time.sleep(0.2)  # Give more time for loop to start
-        
-        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
-        try:
-            result = future.result(timeout=30)  # 30 second timeout
-            return result
-        except Exception as e:
-            raise e
-    
-    def cleanup(self):
-        """Clean up the background thread and loop"""
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop)
-        if self.thread and self.thread.is_alive():
-            self.thread.join(timeout=5)
+@st.cache_resource
+def get_runtime():
+    """One event loop thread for the whole process, shared by every browser session"""
+    runtime = AsyncRuntime()
+    runtime.start()
+    atexit.register(runtime.shutdown)
+    return runtime
 
-# Initialize the async runner
-if "async_runner" not in st.session_state:
-    st.session_state.async_runner = AsyncRunner()
+runtime = get_runtime()
 
 async def get_agentic_response(user_input: str, thread_id: str):
-    """Get response from the agentic flow"""
-    try:
-        print(f"Getting agentic response for: {user_input[:50]}...")
-        
-        # Prepare the config with thread_id for conversation continuity
-        config = {"configurable": {"thread_id": thread_id}}
-        
-        # Create the initial state with user input
-        initial_state = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_input
-                    }
-                ]
-            }
-        
-        # Get the agent response using the simplified flow
-        result = await agentic_flow.ainvoke(initial_state, config=config)
-        
-        print("Agentic response received successfully")
-        final_message = result["messages"][-1]["content"]
-        return final_message, None
-        
-    except Exception as e:
-        error_msg = f"Error getting agentic response: {str(e)}\n{traceback.format_exc()}"
-        print(f"Agentic response error: {error_msg}")
-        return None, error_msg
+    """Stream events from the agentic flow for one user message"""
+    print(f"Getting agentic response for: {user_input[:50]}...")
+    
+    # The thread_id keeps the conversation going across turns
+    async for event in stream_turn(user_input, thread_id):
+        yield event
+    
+    print("Agentic response received successfully")
+
+# Progress labels shown while the agents work
+NODE_LABELS = {
+    "compact_memory": "Reviewing the conversation...",
+    "zerodha_agent": "Zerodha agent is working...",
+    "financial_analyst": "Financial analyst is working...",
+    "join": "Combining the agents' findings...",
+    "end_conversation": "Writing the answer...",
+}
+
+def response_tokens(events, status):
+    """Update the status box on progress events and yield the answer tokens"""
+    for event in events:
+        if event["type"] == "token":
+            yield event["content"]
+        elif event["node"] in NODE_LABELS:
+            status.update(label=NODE_LABELS[event["node"]])
+
+def show_artifacts(handles):
+    """Resolve chart handles of an answer and show their images"""
+    store = get_artifact_store()
+    for handle in handles:
+        artifact = store.get(handle)
+        if artifact is None:
+            st.caption(f"Chart {handle} is no longer available")
+        elif artifact.mime_type == "image/svg+xml":
+            st.image(artifact.data.decode("utf-8"))
+        else:
+            st.image(artifact.data)
 
 # UI Components
 with st.sidebar:
@@ -200,6 +161,7 @@ with chat_container:
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            show_artifacts(message.get("artifacts", []))
             
             # Show debug info if enabled
             if show_debug and "debug_info" in message:
@@ -222,47 +184,47 @@ if user_input:
     
     # Get agent response
     with st.chat_message("assistant"):
-        with st.spinner("Thinking..."):
-            try:
-                # Get response from agentic flow using the background thread
-                response_data, error = st.session_state.async_runner.run_async(
-                    get_agentic_response(user_input, st.session_state.thread_id)
-                )
-                
-                if error:
-                    st.error(f"Error: {error}")
-                    assistant_message = f"I encountered an error: {error}"
-                else:
-                    # Extract the response content
-                    if isinstance(response_data, dict):
-                        # If response is a dict, try to get the main content
-                        assistant_message = str(response_data.get('content', response_data.get('response', str(response_data))))
-                    else:
-                        assistant_message = str(response_data) if response_data else "I'm sorry, I couldn't generate a response."
-                
+        status = st.status("Thinking...")
+        try:
+            # Stream the response from the agentic flow running on the shared event loop
+            events = runtime.stream(
+                get_agentic_response(user_input, st.session_state.thread_id)
+            )
+            response_data = st.write_stream(response_tokens(events, status))
+            status.update(label="Done", state="complete")
+            
+            assistant_message = str(response_data) if response_data else "I'm sorry, I couldn't generate a response."
+            if not response_data:
                 st.markdown(assistant_message)
-                
-                assistant_msg = {
-                    "role": "assistant", 
-                    "content": assistant_message
+            
+            # Charts come back as handles, show the images they refer to
+            handles = find_handles(assistant_message)
+            show_artifacts(handles)
+            
+            assistant_msg = {
+                "role": "assistant", 
+                "content": assistant_message,
+                "artifacts": handles
+            }
+            
+            if show_debug:
+                assistant_msg["debug_info"] = {
+                    "raw_response": response_data,
+                    "thread_id": st.session_state.thread_id,
+                    "response_type": type(response_data).__name__
                 }
-                
-                if show_debug:
-                    assistant_msg["debug_info"] = {
-                        "raw_response": response_data,
-                        "thread_id": st.session_state.thread_id,
-                        "response_type": type(response_data).__name__
-                    }
-                
-                st.session_state.messages.append(assistant_msg)
-                
-            except Exception as e:
-                error_msg = f"Unexpected error: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": error_msg
-                })
+            
+            st.session_state.messages.append(assistant_msg)
+            
+        except Exception as e:
+            status.update(label="Failed", state="error")
+            error_msg = f"Unexpected error: {str(e)}"
+            print(f"Agentic response error: {error_msg}\n{traceback.format_exc()}")
+            st.error(error_msg)
+            st.session_state.messages.append({
+                "role": "assistant", 
+                "content": error_msg
+            })
 
 # Footer
 st.markdown("---")
@@ -274,16 +236,3 @@ st.markdown(
     """, 
     unsafe_allow_html=True
 )
-
-# Cleanup function (called when app is stopped)
-def cleanup():
-    """Cleanup resources"""
-    try:
-        if st.session_state.async_runner:
-            st.session_state.async_runner.cleanup()
-    except Exception as e:
-        print(f"Cleanup error: {e}")
-
-# Register cleanup function
-import atexit
-atexit.register(cleanup)
\ No newline at end of file
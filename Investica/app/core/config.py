@@ -1,7 +1,10 @@
 """Configuration module for the application."""
 
 import os
+import queue
+import atexit
 import logging
+import logging.handlers
 from functools import lru_cache
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -15,9 +18,31 @@ class Settings(BaseSettings):
     Attributes:
         app_name: Name of the application
         debug: Debug mode flag
+        environment: "development" (auto-reload, one worker) or "production"
+        host: Interface the API server binds to
+        port: Port the API server listens on
+        workers: Worker processes in production, one per core by default
+        loop: Event loop implementation ("auto" picks uvloop when installed)
+        http: HTTP protocol implementation ("auto" picks httptools when installed)
+        keep_alive: Seconds an idle keep-alive connection stays open
+        backlog: Maximum number of pending connections
+        log_file: File the application logs are written to
     """
     app_name: str = "Portfolio Assessment Agentic AI Backend"
     debug: bool = bool(os.getenv("DEBUG", False))
+    environment: str = os.getenv("ENVIRONMENT", "development")
+    host: str = os.getenv("HOST", "0.0.0.0")
+    port: int = int(os.getenv("PORT", "8000"))
+    workers: int = int(os.getenv("WORKERS", os.cpu_count() or 1))
+    loop: str = os.getenv("UVICORN_LOOP", "auto")
+    http: str = os.getenv("UVICORN_HTTP", "auto")
+    keep_alive: int = int(os.getenv("KEEP_ALIVE", "5"))
+    backlog: int = int(os.getenv("BACKLOG", "2048"))
+    log_file: str = os.getenv("LOG_FILE", "app.log")
+
+    @property
+    def production(self) -> bool:
+        return self.environment.lower() == "production"
 
 
 @lru_cache()
@@ -30,12 +55,22 @@ def get_settings() -> Settings:
     return Settings()
 
 
-# Configure logging
+# Configure logging. Records are formatted and enqueued by the QueueHandler and a
+# listener thread does the blocking file and console writes, so logging never
+# stalls the event loop.
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.FileHandler(get_settings().log_file),
+    logging.StreamHandler(),
+    respect_handler_level=True,
+)
 logging.basicConfig(
     level=logging.INFO if not get_settings().debug else logging.DEBUG,
     format="%(asctime)s - %(levelname)s - %(message)s",
     handlers=[
-        logging.FileHandler("app.log"),
-        logging.StreamHandler()
+        logging.handlers.QueueHandler(_log_queue)
     ]
-) 
\ No newline at end of file
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
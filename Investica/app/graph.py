@@ -1,15 +1,20 @@
 from pydantic_ai import Agent
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
-from typing import TypedDict, Annotated, List
+from typing import TypedDict, Annotated, AsyncIterator, List
 from langgraph.types import interrupt
+from langgraph.config import get_config, get_stream_writer
 from dotenv import load_dotenv
 import logfire
+import functools
 import asyncio
+import logging
 import uuid
 
 from app.utils import model
-from app.agents import get_zerodha_agent
+from app.utils.router import ROUTER_FAST_PATH_CONFIDENCE, Route, route_by_rules, should_stop, log_route
+from app.utils.checkpointer import get_checkpointer
+from app.utils.memory import NODE_TOKEN_BUDGETS, merge_messages, render_window, split_for_summary, summary_message, render_message
+from app.agents import get_zerodha_agent, get_financial_analyst
 
 # Load environment variables
 load_dotenv()
@@ -19,6 +24,7 @@ logfire.configure(send_to_logfire='never')
 
 router_agent = Agent(  
     model = model,
+    output_type=List[Route],
     system_prompt='Your job is to route the user to the relevant agent.',  
 )
 
@@ -27,102 +33,200 @@ end_conversation_agent = Agent(
     system_prompt='Your job is to end a conversation and summarize the whole conversation.',  
 )
 
+memory_agent = Agent(
+    model = model,
+    system_prompt='Your job is to compress a conversation into a short summary that keeps every fact, figure, ticker and decision needed to continue it.',
+)
+
+def collect_findings(existing: List[dict], new: List[dict] | None) -> List[dict]:
+    # Specialists running in parallel append their findings, None clears them after the join
+    return [] if new is None else existing + new
+
 # Define state schema
 class AgentState(TypedDict):
-    messages: Annotated[List[dict], lambda x, y: x + y]
+    # Appended to, except older messages get replaced by a summary once the thread outgrows its budget
+    messages: Annotated[List[dict], merge_messages]
+    # Answers of the specialists of the current round, merged into messages by the join node
+    findings: Annotated[List[dict], collect_findings]
+    # Specialist rounds in the current turn, reset to 0 with every user message
+    hops: int
+
+async def compact_memory(state: AgentState):
+    # Fold older turns into a single summary message once the thread exceeds its token budget
+    count = split_for_summary(state['messages'])
+    if not count:
+        return {}
+
+    conversation = "\n".join(render_message(message) for message in state['messages'][:count])
+    try:
+        result = await memory_agent.run(f"Summarize this conversation:\n\n{conversation}")
+    except Exception as e:
+        logging.error(f"Failed to summarize the conversation, keeping it as is: {e}")
+        return {}
+
+    logging.info(f"Summarized {count} earlier messages")
+    return {"messages": [summary_message(result.output, count)]}
+
+async def router_agen(state: AgentState) -> List[str]:
+    # Bound the number of specialist rounds per turn and break out of loops
+    if reason := should_stop(state['messages'], state.get('hops', 0)):
+        logging.warning(f"Ending turn early: {reason}")
+        log_route(Route.end_conversation.value, "guard")
+        return [Route.end_conversation.value]
+
+    # Unambiguous turns are routed by rules without a model call
+    routes, confidence = route_by_rules(state['messages'])
+    if routes and confidence >= ROUTER_FAST_PATH_CONFIDENCE:
+        log_route("+".join(routes), "fast_path")
+        return routes
 
-async def router_agen(state: AgentState):
     prompt = f"""
-        Based on the conversation till now, your task is to route to which agent we should go.
+        Based on the conversation till now, your task is to route to which agents we should go.
+        Pick every agent the request needs, they will work in parallel.
 
-        {state['messages']}
+        {render_window(state['messages'], NODE_TOKEN_BUDGETS['router'])}
 
         List of available agents:
-        "zerodha_agent": It is capable of doing trade execution, market anaylsis and post-trade tasks.
-        "end_conversation_agent:" It's task is to end the conversation and provide the final result.
+        zerodha_agent: It is capable of doing trade execution, market anaylsis and post-trade tasks on Indian markets.
+        financial_analyst: It is capable of analysing global stocks and crypto: prices, fundamentals, statements, filings and news.
+        end_conversation: It's task is to end the conversation and provide the final result.
 
-        Output should the name of the agent which is chosen.
-
-        Example Outputs:
-        "end_conversation_agent"
-        "zerodha_agent"
+        Choose only end_conversation once the request has been answered.
     """
 
-    result = await router_agent.run(prompt)
-    next_action = result.output
+    try:
+        result = await router_agent.run(prompt)
+        routes = list(dict.fromkeys(route.value for route in result.output))
+    except Exception as e:
+        logging.error(f"Router failed, ending the turn: {e}")
+        routes = []
 
-    if next_action == "zerodha_agent":
-        return "zerodha_agent"
-    else:
-        return "end_conversation"
+    # Wrapping up and dispatching more work are exclusive, dispatching wins
+    specialists = [route for route in routes if route != Route.end_conversation.value]
+    routes = specialists or [Route.end_conversation.value]
+    log_route("+".join(routes), "llm")
+    return routes
 
-async def zerodga_agent(state: AgentState):
-    mcp_client, mcp_agent = await get_zerodha_agent()
-    
+async def run_specialist(name: str, get_agent, state: AgentState):
+    # Run one specialist on the recent conversation and report its answer as a finding
+    mcp_client, mcp_agent = await get_agent()
     try:
-            result = await mcp_agent.run(state['messages'][-1], message_history=state['messages'][:-1])
-            
-            # Add the new messages to the chat history
-            return {
-                "messages": [
-                    {
-                        "role": "assistant", 
-                        "content": result.output
-                    }
-                ]
-            }
+        result = await mcp_agent.run(render_window(state['messages'], NODE_TOKEN_BUDGETS['specialist']))
+        return {"findings": [{"agent": name, "content": result.output}]}
     except Exception as e:
-        print(f"\n[Error] An error occurred: {str(e)}")
+        print(f"\n[Error] An error occurred in {name}: {str(e)}")
+        return {}
     finally:
         await mcp_client.cleanup()
 
+async def zerodga_agent(state: AgentState):
+    # The Kite connection holds a login, so every conversation thread gets its own
+    thread_id = get_config()["configurable"]["thread_id"]
+    return await run_specialist(Route.zerodha_agent.value, functools.partial(get_zerodha_agent, thread_id), state)
+
+async def financial_analyst(state: AgentState):
+    return await run_specialist(Route.financial_analyst.value, get_financial_analyst, state)
+
+# Agent names shown above their part of a merged answer
+AGENT_TITLES = {
+    Route.zerodha_agent.value: "Zerodha agent",
+    Route.financial_analyst.value: "Financial analyst",
+}
+
+async def join(state: AgentState):
+    # Merge the findings of the round into one assistant message. The round is
+    # counted even when every specialist failed, so failures cannot loop forever.
+    findings = sorted(state.get('findings', []), key=lambda finding: list(AGENT_TITLES).index(finding['agent']))
+    update = {"findings": None, "hops": state.get('hops', 0) + 1}
+    if len(findings) == 1:
+        update["messages"] = [{"role": "assistant", "content": findings[0]["content"]}]
+    elif findings:
+        sections = [f"## {AGENT_TITLES.get(finding['agent'], finding['agent'])}\n{finding['content']}" for finding in findings]
+        update["messages"] = [{"role": "assistant", "content": "\n\n".join(sections)}]
+    return update
+
 # End of conversation agent to give instructions for executing the agent
 async def end_conversation(state: AgentState):
     prompt = f"""Summarize the conversation and give the final output, ther user will see only your output, so make you sure you present a good, concise yet clear output. You may make tables, charts or any other form of visual representaiton of the data to make the output more appealing.
     
     This is the conversation:
-    {state['messages']}
+    {render_window(state['messages'], NODE_TOKEN_BUDGETS['end_conversation'])}
     """
 
-    result = await end_conversation_agent.run(prompt)
+    # Stream the answer as it is generated, this is the only output the user sees
+    writer = get_stream_writer()
+    output = ""
+    async with end_conversation_agent.run_stream(prompt) as result:
+        async for delta in result.stream_text(delta=True):
+            output += delta
+            writer({"type": "token", "content": delta})
     return {
         "messages": [
             {
                 "role": "assistant", 
-                "content": result.output
+                "content": output
             }
         ]
     }
 
 builder = StateGraph(AgentState)
 
+# Routes of the router to nodes, a list of several specialists runs them in parallel
+routes = {
+    "zerodha_agent": "zerodha_agent", 
+    "financial_analyst": "financial_analyst",
+    "end_conversation": "end_conversation"
+}
+
 # Add nodes
+builder.add_node("compact_memory", compact_memory)
 builder.add_node("zerodha_agent", zerodga_agent)
+builder.add_node("financial_analyst", financial_analyst)
+builder.add_node("join", join)
 builder.add_node("end_conversation", end_conversation)
 
 # Set edges
-builder.add_conditional_edges(
-    START,
-    router_agen,
-    {
-        "zerodha_agent": "zerodha_agent", 
-        "end_conversation": "end_conversation"
-    }
-)
-builder.add_conditional_edges(
-    "zerodha_agent",
-    router_agen,
-    {
-        "zerodha_agent": "zerodha_agent", 
-        "end_conversation": "end_conversation"
-    }
-)
+builder.add_edge(START, "compact_memory")
+builder.add_conditional_edges("compact_memory", router_agen, routes)
+# The join runs once per round, after every specialist dispatched in it has finished
+builder.add_edge("zerodha_agent", "join")
+builder.add_edge("financial_analyst", "join")
+builder.add_conditional_edges("join", router_agen, routes)
 builder.add_edge("end_conversation", END)
 
-# Configure persistence
-memory = MemorySaver()
+# Configure persistence (in memory by default, CHECKPOINTER=sqlite to persist and share threads)
+memory = get_checkpointer()
 agentic_flow = builder.compile(checkpointer=memory)
 
+async def stream_turn(user_input: str, thread_id: str) -> AsyncIterator[dict]:
+    """Run one user turn through the agentic flow, yielding events as they happen.
+
+    Args:
+        user_input: The user's message.
+        thread_id: Conversation thread the turn belongs to.
+
+    Yields:
+        dict: {"type": "status", "node": name} whenever a node finishes, and
+        {"type": "token", "content": text} for each chunk of the final answer.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    initial_state = {
+        "messages": [
+            {
+                "role": "user",
+                "content": user_input
+            }
+        ],
+        "hops": 0
+    }
+
+    async for mode, chunk in agentic_flow.astream(initial_state, config=config, stream_mode=["updates", "custom"]):
+        if mode == "custom":
+            yield chunk
+        else:
+            for node in chunk:
+                yield {"type": "status", "node": node}
+
 async def run_cli():
     """Interactive CLI for testing the agentic flow"""
     print("🚀 Agentic Flow CLI Test")
@@ -136,7 +240,6 @@ async def run_cli():
     
     # Generate a unique thread ID for this session
     thread_id = str(uuid.uuid4())
-    config = {"configurable": {"thread_id": thread_id}}
     
     while True:
         try:
@@ -149,7 +252,6 @@ async def run_cli():
                 break
             elif user_input.lower() == 'clear':
                 thread_id = str(uuid.uuid4())
-                config = {"configurable": {"thread_id": thread_id}}
                 print("\n🔄 New conversation started!")
                 continue
             elif user_input.lower() == 'help':
@@ -163,25 +265,20 @@ async def run_cli():
                 print("Please enter a message or command.")
                 continue
             
-            # Prepare initial state with user message
-            initial_state = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_input
-                    }
-                ]
-            }
-            
             print("\n🤖 Processing...")
             
-            # Run the agentic flow
-            result = await agentic_flow.ainvoke(initial_state, config=config)
+            # Run the agentic flow, printing the final response as it streams in
+            answered = False
+            async for event in stream_turn(user_input, thread_id):
+                if event["type"] != "token":
+                    continue
+                if not answered:
+                    print("\n🎯 Assistant: ", end="", flush=True)
+                    answered = True
+                print(event["content"], end="", flush=True)
             
-            # Display the final response
-            if result and "messages" in result:
-                final_message = result["messages"][-1]["content"]
-                print(f"\n🎯 Assistant: {final_message}")
+            if answered:
+                print()
             else:
                 print("\n⚠️  No response received from the agents.")
                 
@@ -1,11 +1,47 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import logging
 
 from app.core.config import get_settings
+from app.agents import get_zerodha_agent, get_financial_analyst
+from app.routers import chat_router, artifacts_router
+from app.utils import get_mcp_pool
+from app.tools.render_pool import get_render_pool
 
 # Get application settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-warm the MCP session pool and chart render workers on startup, close them on shutdown.
+
+    The MCP servers are started once and handed back to the pool, so the
+    first chat request does not pay their startup and every request on this
+    worker's event loop shares them. Servers with a per-session login (Kite)
+    get a connection per conversation thread, and only when the agent is set
+    up to use their tools (ZERODHA_AGENT_TOOLS); warming them up then checks
+    that they start and fills the shared tool catalog.
+    """
+    for name, factory in (("zerodha", get_zerodha_agent), ("financial analyst", get_financial_analyst)):
+        try:
+            client, _ = await factory()
+            # Servers that fail to start are skipped, report them here rather than as empty answers later
+            for server, error in client.startup_errors.items():
+                logging.error(f"MCP server {server} of the {name} agent failed to start: {error}")
+            await client.cleanup()
+        except Exception as e:
+            logging.error(f"Failed to pre-warm the MCP servers of the {name} agent: {e}")
+    try:
+        await get_render_pool().start()
+    except Exception as e:
+        logging.error(f"Failed to start the chart render workers: {e}")
+    yield
+    await get_render_pool().close()
+    await get_mcp_pool().close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Portfolio Assessment Agentic AI API",
@@ -13,6 +49,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -27,6 +64,8 @@ app.add_middleware(
 )
 
 # Include routers
+app.include_router(chat_router)
+app.include_router(artifacts_router)
 
 
 @app.get("/", tags=["health"])
@@ -0,0 +1,4 @@
+"""HTTP routers of the backend API."""
+
+from app.routers.chat import router as chat_router
+from app.routers.artifacts import router as artifacts_router
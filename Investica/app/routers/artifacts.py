@@ -0,0 +1,26 @@
+"""Artifact endpoint serving rendered charts.
+
+Chart tools return a handle (``chart:<hash>``) instead of the image, and
+clients fetch the bytes with ``GET /artifacts/{handle}``. Handles are
+content hashes, so responses never change and are cached for long.
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import Response
+
+from app.tools.artifacts import get_artifact_store
+
+router = APIRouter(prefix="/artifacts", tags=["artifacts"])
+
+
+@router.get("/{handle}")
+async def get_artifact(handle: str) -> Response:
+    """Return the image stored under ``handle`` ("chart:<hash>" or just the hash)."""
+    artifact = get_artifact_store().get(handle)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired artifact: {handle}")
+    return Response(
+        content=artifact.data,
+        media_type=artifact.mime_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{handle.split(":")[-1]}"'},
+    )
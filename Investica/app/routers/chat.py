@@ -0,0 +1,101 @@
+"""Chat endpoints driving the agentic flow.
+
+``POST /chat`` answers with the whole reply once the turn is done, and
+``POST /chat/stream`` sends progress and answer tokens as Server-Sent
+Events while the agents work. Both continue the conversation named by
+``thread_id`` and start a new one when it is omitted.
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import AsyncIterator
+import weakref
+import asyncio
+import logging
+import json
+import uuid
+
+from app.graph import stream_turn
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+# Turns of the same thread run one at a time so they never interleave checkpoints
+_thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+
+class ChatRequest(BaseModel):
+    """A user message for the agentic flow."""
+
+    message: str = Field(min_length=1)
+    thread_id: str | None = None
+
+
+class ChatResponse(BaseModel):
+    """The final answer of the agentic flow for one user message."""
+
+    thread_id: str
+    response: str
+
+
+def thread_lock(thread_id: str) -> asyncio.Lock:
+    """Return the lock serializing the turns of ``thread_id``."""
+    lock = _thread_locks.get(thread_id)
+    if lock is None:
+        lock = _thread_locks[thread_id] = asyncio.Lock()
+    return lock
+
+
+def sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.post("", response_model=ChatResponse)
+async def chat(request: ChatRequest) -> ChatResponse:
+    """Run one turn of the conversation and return the final answer."""
+    thread_id = request.thread_id or str(uuid.uuid4())
+    async with thread_lock(thread_id):
+        try:
+            tokens = [
+                event["content"]
+                async for event in stream_turn(request.message, thread_id)
+                if event["type"] == "token"
+            ]
+        except Exception as e:
+            logging.error(f"Chat turn failed for thread {thread_id}: {e}")
+            raise HTTPException(status_code=502, detail=f"The agents failed to answer: {e}")
+    return ChatResponse(thread_id=thread_id, response="".join(tokens))
+
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """Run one turn of the conversation, streaming it as Server-Sent Events.
+
+    Events are ``status`` (a node finished), ``token`` (a chunk of the
+    answer), then ``done`` with the full answer, or ``error``.
+    """
+    thread_id = request.thread_id or str(uuid.uuid4())
+
+    async def events() -> AsyncIterator[str]:
+        async with thread_lock(thread_id):
+            tokens = []
+            try:
+                async for event in stream_turn(request.message, thread_id):
+                    if event["type"] == "token":
+                        tokens.append(event["content"])
+                        yield sse("token", {"content": event["content"]})
+                    else:
+                        yield sse("status", {"node": event["node"]})
+            except Exception as e:
+                logging.error(f"Chat stream failed for thread {thread_id}: {e}")
+                yield sse("error", {"thread_id": thread_id, "detail": str(e)})
+                return
+            yield sse("done", {"thread_id": thread_id, "response": "".join(tokens)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Ask proxies not to buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Thread-Id": thread_id},
+    )
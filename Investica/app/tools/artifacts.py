@@ -0,0 +1,193 @@
+"""Store of rendered charts, addressed by ``chart:<hash>`` handles.
+
+Artifacts are kept in a per-process LRU bounded by total bytes, and also
+in ``CHART_ARTIFACT_DIR`` when set so server workers share them (see run.py).
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import threading
+import hashlib
+import logging
+import re
+import os
+
+from app.tools.rendering import MIME_TYPES
+
+ARTIFACT_PREFIX = "chart:"
+# Matches a handle anywhere in a text, e.g. in the final answer
+HANDLE_PATTERN = re.compile(r"chart:([0-9a-f]{32})")
+
+ARTIFACT_MAX_BYTES = int(os.getenv("CHART_ARTIFACT_MAX_BYTES", str(64 * 1024 * 1024)))
+ARTIFACT_DIR = os.getenv("CHART_ARTIFACT_DIR") or None
+
+_EXTENSIONS = {mime_type: extension for extension, mime_type in MIME_TYPES.items()}
+
+
+@dataclass(frozen=True)
+class Artifact:
+    """A stored chart image.
+
+    Attributes:
+        handle: The short reference returned to the model ("chart:<hash>")
+        data: The encoded image
+        mime_type: MIME type of ``data``
+        metadata: Chart metadata (type, title, profile...), memory only
+    """
+
+    handle: str
+    data: bytes
+    mime_type: str
+    metadata: dict = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+@dataclass
+class ArtifactStats:
+    """Counters of an ArtifactStore."""
+
+    puts: int = 0
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    writes: int = 0
+
+
+def content_hash(data: bytes) -> str:
+    """Return the hex digest identifying ``data``."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def parse_handle(handle: str) -> str | None:
+    """Return the hash of a handle (with or without the prefix), None if malformed."""
+    digest = handle[len(ARTIFACT_PREFIX):] if handle.startswith(ARTIFACT_PREFIX) else handle
+    return digest if re.fullmatch(r"[0-9a-f]{32}", digest) else None
+
+
+def find_handles(text: str) -> list[str]:
+    """Return the distinct artifact handles mentioned in ``text``, in order."""
+    return list(dict.fromkeys(ARTIFACT_PREFIX + digest for digest in HANDLE_PATTERN.findall(text)))
+
+
+class ArtifactStore:
+    """Byte-bounded LRU of chart images backed by an optional shared directory.
+
+    Safe to use from several threads: the Streamlit sessions read it while
+    the agents on the runtime loop write to it.
+    """
+
+    def __init__(self, max_bytes: int = ARTIFACT_MAX_BYTES, shared_dir: str | None = ARTIFACT_DIR) -> None:
+        self.max_bytes = max_bytes
+        self.shared_dir = shared_dir
+        self.stats = ArtifactStats()
+        self._artifacts: OrderedDict[str, Artifact] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    def put(self, data: bytes, mime_type: str, metadata: dict | None = None) -> Artifact:
+        """Store an encoded image and return its artifact.
+
+        Storing the same bytes again returns the existing handle.
+        """
+        digest = content_hash(data)
+        artifact = Artifact(ARTIFACT_PREFIX + digest, data, mime_type, metadata or {})
+        with self._lock:
+            self.stats.puts += 1
+            self._remember(digest, artifact)
+            # Written at once so other processes sharing the directory can serve it
+            self._write(digest, artifact)
+        return artifact
+
+    def get(self, handle: str) -> Artifact | None:
+        """Return the artifact of ``handle``, or None if it is unknown or evicted.
+
+        Artifacts not in memory are looked up in the shared directory, which
+        also holds those put by other processes.
+        """
+        digest = parse_handle(handle)
+        if digest is None:
+            return None
+        with self._lock:
+            artifact = self._artifacts.get(digest)
+            if artifact is not None:
+                self._artifacts.move_to_end(digest)
+                self.stats.hits += 1
+                return artifact
+            artifact = self._load(digest)
+            if artifact is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._remember(digest, artifact)
+            return artifact
+
+    def snapshot(self) -> dict:
+        """Return the counters and current size, for logging and diagnostics."""
+        with self._lock:
+            return {**vars(self.stats), "artifacts": len(self._artifacts), "bytes": self._bytes}
+
+    def _remember(self, digest: str, artifact: Artifact) -> None:
+        previous = self._artifacts.pop(digest, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._artifacts[digest] = artifact
+        self._bytes += artifact.size
+        # Keep the newest artifact even when it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._artifacts) > 1:
+            _, evicted = self._artifacts.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats.evictions += 1
+
+    def _path(self, digest: str, mime_type: str) -> str:
+        return os.path.join(self.shared_dir, f"{digest}.{_EXTENSIONS.get(mime_type, 'bin')}")
+
+    def _write(self, digest: str, artifact: Artifact) -> None:
+        if not self.shared_dir:
+            return
+        path = self._path(digest, artifact.mime_type)
+        if os.path.exists(path):
+            return
+        try:
+            # Write then rename so a reader never sees a partial file; the
+            # temporary name is per process as workers may write the same chart
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(artifact.data)
+            os.replace(temporary, path)
+            self.stats.writes += 1
+        except OSError as e:
+            logging.error(f"Failed to write chart artifact {artifact.handle}: {e}")
+
+    def _load(self, digest: str) -> Artifact | None:
+        if not self.shared_dir:
+            return None
+        for mime_type in _EXTENSIONS:
+            path = self._path(digest, mime_type)
+            try:
+                with open(path, "rb") as file:
+                    return Artifact(ARTIFACT_PREFIX + digest, file.read(), mime_type)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logging.error(f"Failed to load chart artifact {digest}: {e}")
+                return None
+        return None
+
+
+_artifact_store: ArtifactStore | None = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store."""
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = ArtifactStore()
+        return _artifact_store
@@ -0,0 +1,99 @@
+"""Render functions of the chart agent tools and app.tools.charts.
+
+Each function draws one chart type from a plain spec on this thread's
+figure template (see app.tools.figures) and encodes it with a rendering
+profile. They live outside ``app.agents`` so the render worker processes
+(see app.tools.render_pool) import only matplotlib and this module, not
+the agents and their models.
+"""
+
+from matplotlib import colormaps
+import numpy as np
+
+from app.tools.figures import MAX_CATEGORY_TICKS, category_positions, get_template, set_category_ticks
+from app.tools.rendering import EncodedImage, RenderProfile
+
+
+def render_histogram(spec: dict, profile: RenderProfile) -> EncodedImage:
+    """Draw a histogram of ``spec['data']``."""
+    data, title, bins = spec["data"], spec["title"], spec["bins"]
+    x_label, y_label, color = spec["x_label"], spec["y_label"], spec["color"]
+    template = get_template("histogram")
+    ax = template.reset(title or 'Distribution Histogram', x_label or 'Values', y_label or 'Frequency')
+    ax.hist(data, bins=bins, color=color, alpha=0.7, edgecolor='black')
+
+    return template.encode(profile)
+
+
+def render_line_chart(spec: dict, profile: RenderProfile) -> EncodedImage:
+    """Draw a line chart of ``spec['y_data']`` against ``spec['x_data']``."""
+    x_data, y_data, title = spec["x_data"], spec["y_data"], spec["title"]
+    x_label, y_label, color = spec["x_label"], spec["y_label"], spec["color"]
+    line_style, marker = spec["line_style"], spec["marker"]
+    template = get_template("line")
+    ax = template.reset(title or 'Line Chart', x_label or 'X Values', y_label or 'Y Values')
+
+    positions, labels = category_positions(x_data)
+    ax.plot(positions, y_data, color=color, linestyle=line_style, marker=marker, markersize=4)
+    if labels:
+        set_category_ticks(ax, positions, labels, max_ticks=MAX_CATEGORY_TICKS)
+
+    return template.encode(profile)
+
+
+def render_bar_chart(spec: dict, profile: RenderProfile) -> EncodedImage:
+    """Draw a (vertical or horizontal) bar chart of ``spec['values']`` per category."""
+    categories, values, title = spec["categories"], spec["values"], spec["title"]
+    x_label, y_label, color = spec["x_label"], spec["y_label"], spec["color"]
+    horizontal = spec["horizontal"]
+    positions = list(range(len(categories)))
+    labels = [str(category) for category in categories]
+
+    if horizontal:
+        template = get_template("barh")
+        ax = template.reset(title or 'Bar Chart', y_label or 'Values', x_label or 'Categories')
+        ax.barh(positions, values, color=color, alpha=0.7)
+        ax.set_yticks(positions, labels)
+    else:
+        template = get_template("bar")
+        ax = template.reset(title or 'Bar Chart', x_label or 'Categories', y_label or 'Values')
+        ax.bar(positions, values, color=color, alpha=0.7)
+        set_category_ticks(ax, positions, labels)
+
+    return template.encode(profile)
+
+
+def render_scatter_plot(spec: dict, profile: RenderProfile) -> EncodedImage:
+    """Draw a scatter plot of ``spec['y_data']`` against ``spec['x_data']``."""
+    x_data, y_data, title = spec["x_data"], spec["y_data"], spec["title"]
+    x_label, y_label, color = spec["x_label"], spec["y_label"], spec["color"]
+    size, alpha = spec["size"], spec["alpha"]
+    template = get_template("scatter")
+    ax = template.reset(title or 'Scatter Plot', x_label or 'X Values', y_label or 'Y Values')
+    ax.scatter(x_data, y_data, c=color, s=size, alpha=alpha)
+
+    return template.encode(profile)
+
+
+def render_pie_chart(spec: dict, profile: RenderProfile) -> EncodedImage:
+    """Draw a pie chart of ``spec['sizes']`` labelled with ``spec['labels']``."""
+    labels, sizes, title = spec["labels"], spec["sizes"], spec["title"]
+    template = get_template("pie")
+    ax = template.reset(title or 'Proportional Distribution')
+    colors = colormaps["Set3"](np.linspace(0, 1, len(labels)))
+    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
+
+    return template.encode(profile)
+
+
+def render_box_plot(spec: dict, profile: RenderProfile) -> EncodedImage:
+    """Draw one box per category of ``spec['data']`` (category -> values)."""
+    data, title = spec["data"], spec["title"]
+    x_label, y_label = spec["x_label"], spec["y_label"]
+    template = get_template("box")
+    ax = template.reset(title or 'Statistical Distribution', x_label or 'Categories', y_label or 'Values')
+    positions = list(range(1, len(data) + 1))
+    ax.boxplot(list(data.values()), positions=positions)
+    set_category_ticks(ax, positions, [str(category) for category in data])
+
+    return template.encode(profile)
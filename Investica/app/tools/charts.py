@@ -1,21 +1,38 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-import numpy as np
+"""Chart helpers returning the encoded image as base64.
+
+These are thin wrappers over ``render_chart``: they draw with the same
+render functions as the chart agent tools (app.tools.chart_renderers), in
+the render worker pool and through the render cache, and only add the
+base64 encoding and metadata of their results.
+"""
+
 from typing import List, Dict, Optional
-import json
 import base64
-import io
-from datetime import datetime
 
-plt.style.use('default')
-sns.set_palette("husl")
+from app.tools.chart_renderers import (
+    render_bar_chart,
+    render_box_plot,
+    render_histogram,
+    render_line_chart,
+    render_pie_chart,
+    render_scatter_plot,
+)
+from app.tools.rendering import EncodedImage
+from app.tools.render_pool import render_chart
+
 
-plt.ioff()
+def _encoded(image: EncodedImage, **metadata) -> Dict[str, str]:
+    return {
+        "image": base64.b64encode(image.data).decode('utf-8'),
+        "mime_type": image.mime_type,
+        "profile": image.profile,
+        **metadata,
+    }
 
-def create_histogram(data: List[float], 
+async def create_histogram(data: List[float], 
                     title: Optional[str] = None,
-                    bins: int = 30) -> Dict[str, str]:
+                    bins: int = 30,
+                    profile: Optional[str] = None) -> Dict[str, str]:
     """
     Create a histogram for numerical data distribution.
     
@@ -23,41 +40,19 @@ def create_histogram(data: List[float],
         data: List of numerical values
         title: Chart title (optional)
         bins: Number of bins (default: 30)
+        profile: Rendering profile (optional, see app.tools.rendering.PROFILES)
     
     Returns:
         Dictionary with base64 image data and metadata
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.hist(data, bins=bins, color='skyblue', alpha=0.7, edgecolor='black')
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Distribution Histogram', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel('Values', fontsize=12)
-    ax.set_ylabel('Frequency', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
-    
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
-        "chart_type": "histogram",
-        "data_points": len(data)
-    }
+    spec = {"data": data, "title": title, "bins": bins, "x_label": None, "y_label": None, "color": 'skyblue'}
+    image = await render_chart(render_histogram, spec, profile)
+    return _encoded(image, chart_type="histogram", data_points=len(data))
 
-def create_bar_chart(categories: List[str], 
+async def create_bar_chart(categories: List[str], 
                     values: List[float],
-                    title: Optional[str] = None) -> Dict[str, str]:
+                    title: Optional[str] = None,
+                    profile: Optional[str] = None) -> Dict[str, str]:
     """
     Create a bar chart for categorical data comparison.
     
@@ -65,42 +60,22 @@ def create_bar_chart(categories: List[str],
         categories: List of category names
         values: List of corresponding values
         title: Chart title (optional)
+        profile: Rendering profile (optional, see app.tools.rendering.PROFILES)
     
     Returns:
         Dictionary with base64 image data and metadata
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.bar(categories, values, color='steelblue', alpha=0.8)
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Bar Chart Comparison', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel('Categories', fontsize=12)
-    ax.set_ylabel('Values', fontsize=12)
-    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-    ax.grid(True, alpha=0.3, axis='y')
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
-    
-    return {
-        "image": image_base64,
-        "mime_type": "image/png", 
-        "chart_type": "bar_chart",
-        "categories": len(categories)
+    spec = {
+        "categories": categories, "values": values, "title": title or 'Bar Chart Comparison',
+        "x_label": None, "y_label": None, "color": 'steelblue', "horizontal": False,
     }
+    image = await render_chart(render_bar_chart, spec, profile)
+    return _encoded(image, chart_type="bar_chart", categories=len(categories))
 
-def create_pie_chart(labels: List[str], 
+async def create_pie_chart(labels: List[str], 
                     sizes: List[float],
-                    title: Optional[str] = None) -> Dict[str, str]:
+                    title: Optional[str] = None,
+                    profile: Optional[str] = None) -> Dict[str, str]:
     """
     Create a pie chart for proportional data.
     
@@ -108,40 +83,19 @@ def create_pie_chart(labels: List[str],
         labels: List of category labels
         sizes: List of corresponding values/sizes
         title: Chart title (optional)
+        profile: Rendering profile (optional, see app.tools.rendering.PROFILES)
     
     Returns:
         Dictionary with base64 image data and metadata
     """
-    fig, ax = plt.subplots(figsize=(8, 8))
-    colors = plt.cm.Set3(np.linspace(0, 1, len(labels)))
-    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Proportional Distribution', fontsize=16, fontweight='bold')
-    
-    ax.axis('equal')
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
-    
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
-        "chart_type": "pie_chart", 
-        "segments": len(labels)
-    }
+    spec = {"labels": labels, "sizes": sizes, "title": title}
+    image = await render_chart(render_pie_chart, spec, profile)
+    return _encoded(image, chart_type="pie_chart", segments=len(labels))
 
-def create_line_chart(x_values: List, 
+async def create_line_chart(x_values: List, 
                      y_values: List,
-                     title: Optional[str] = None) -> Dict[str, str]:
+                     title: Optional[str] = None,
+                     profile: Optional[str] = None) -> Dict[str, str]:
     """
     Create a line chart for trend analysis.
     
@@ -149,41 +103,22 @@ def create_line_chart(x_values: List,
         x_values: X-axis data points
         y_values: Y-axis data points  
         title: Chart title (optional)
+        profile: Rendering profile (optional, see app.tools.rendering.PROFILES)
     
     Returns:
         Dictionary with base64 image data and metadata
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(x_values, y_values, color='blue', marker='o', linewidth=2, markersize=6)
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Trend Analysis', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel('X Values', fontsize=12)
-    ax.set_ylabel('Y Values', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
-    
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
-        "chart_type": "line_chart",
-        "data_points": len(x_values)
+    spec = {
+        "x_data": x_values, "y_data": y_values, "title": title or 'Trend Analysis',
+        "x_label": None, "y_label": None, "color": 'blue', "line_style": '-', "marker": 'o',
     }
+    image = await render_chart(render_line_chart, spec, profile)
+    return _encoded(image, chart_type="line_chart", data_points=len(x_values))
 
-def create_scatter_plot(x_values: List[float], 
+async def create_scatter_plot(x_values: List[float], 
                        y_values: List[float],
-                       title: Optional[str] = None) -> Dict[str, str]:
+                       title: Optional[str] = None,
+                       profile: Optional[str] = None) -> Dict[str, str]:
     """
     Create a scatter plot for correlation analysis.
     
@@ -191,75 +126,32 @@ def create_scatter_plot(x_values: List[float],
         x_values: X-axis data points
         y_values: Y-axis data points
         title: Chart title (optional)
+        profile: Rendering profile (optional, see app.tools.rendering.PROFILES)
     
     Returns:
         Dictionary with base64 image data and metadata
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.scatter(x_values, y_values, color='red', s=50, alpha=0.6)
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Correlation Analysis', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel('X Values', fontsize=12)
-    ax.set_ylabel('Y Values', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
-    
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
-        "chart_type": "scatter_plot",
-        "data_points": len(x_values)
+    spec = {
+        "x_data": x_values, "y_data": y_values, "title": title or 'Correlation Analysis',
+        "x_label": None, "y_label": None, "color": 'red', "size": 50, "alpha": 0.6,
     }
+    image = await render_chart(render_scatter_plot, spec, profile)
+    return _encoded(image, chart_type="scatter_plot", data_points=len(x_values))
 
-def create_box_plot(data_dict: Dict[str, List[float]],
-                   title: Optional[str] = None) -> Dict[str, str]:
+async def create_box_plot(data_dict: Dict[str, List[float]],
+                   title: Optional[str] = None,
+                   profile: Optional[str] = None) -> Dict[str, str]:
     """
     Create a box plot for statistical distribution analysis.
     
     Args:
         data_dict: Dictionary with category names as keys and data lists as values
         title: Chart title (optional)
+        profile: Rendering profile (optional, see app.tools.rendering.PROFILES)
     
     Returns:
         Dictionary with base64 image data and metadata
     """
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.boxplot(data_dict.values(), labels=data_dict.keys())
-    
-    if title:
-        ax.set_title(title, fontsize=16, fontweight='bold')
-    else:
-        ax.set_title('Statistical Distribution', fontsize=16, fontweight='bold')
-    
-    ax.set_xlabel('Categories', fontsize=12)
-    ax.set_ylabel('Values', fontsize=12)
-    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-    ax.grid(True, alpha=0.3)
-    plt.tight_layout()
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-    buffer.seek(0)
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    buffer.close()
-    plt.close(fig)
-    
-    return {
-        "image": image_base64,
-        "mime_type": "image/png",
-        "chart_type": "box_plot",
-        "categories": len(data_dict)
-    }
\ No newline at end of file
+    spec = {"data": data_dict, "title": title, "x_label": None, "y_label": None}
+    image = await render_chart(render_box_plot, spec, profile)
+    return _encoded(image, chart_type="box_plot", categories=len(data_dict))
@@ -0,0 +1,149 @@
+"""Reusable, pyplot-free figure templates for the charts, kept per thread.
+
+Categorical data is drawn at numeric positions with the categories as tick
+labels, since matplotlib's category units would accumulate on a reused axis.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from numbers import Real
+import threading
+
+from cycler import cycler
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import AutoLocator, ScalarFormatter
+import numpy as np
+import seaborn as sns
+
+from app.tools.rendering import EncodedImage, RenderProfile, encode_figure
+
+# Default colour cycle of the charts (seaborn's "husl" palette)
+PALETTE = cycler(color=sns.color_palette("husl"))
+TITLE_FONT = {"fontsize": 16, "fontweight": "bold"}
+LABEL_FONTSIZE = 12
+GRID_ALPHA = 0.3
+# Most tick labels shown for categorical x values of a line chart
+MAX_CATEGORY_TICKS = 12
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Layout of a chart type.
+
+    Attributes:
+        figsize: Figure size in inches
+        grid: Axis of the grid lines ("both", "x" or "y"), None for no grid
+        equal_aspect: Keep the axes square (pie charts)
+    """
+
+    figsize: tuple[float, float] = (10, 6)
+    grid: str | None = "both"
+    equal_aspect: bool = False
+
+
+TEMPLATES = {
+    "histogram": TemplateSpec(),
+    "line": TemplateSpec(),
+    "scatter": TemplateSpec(),
+    "bar": TemplateSpec(grid="y"),
+    "barh": TemplateSpec(grid="x"),
+    "box": TemplateSpec(),
+    "pie": TemplateSpec(figsize=(8, 8), grid=None, equal_aspect=True),
+}
+
+
+class FigureTemplate:
+    """A figure and axes configured for one chart type, redrawn for every chart."""
+
+    def __init__(self, spec: TemplateSpec) -> None:
+        self.spec = spec
+        self.figure = Figure(figsize=spec.figsize, layout="tight")
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+        self.ax.title.set(**TITLE_FONT)
+        self.ax.xaxis.label.set_fontsize(LABEL_FONTSIZE)
+        self.ax.yaxis.label.set_fontsize(LABEL_FONTSIZE)
+        if spec.grid:
+            self.ax.grid(True, alpha=GRID_ALPHA, axis=spec.grid)
+        if spec.equal_aspect:
+            self.ax.set_aspect("equal")
+
+    def reset(self, title: str = "", x_label: str = "", y_label: str = ""):
+        """Remove the previous chart and set the texts of the next one.
+
+        Returns:
+            Axes: The cleared axes to draw on.
+        """
+        ax = self.ax
+        # Containers (bars, histograms, error bars) first: removing one removes its artists
+        for container in list(ax.containers):
+            container.remove()
+        for artist in [*ax.lines, *ax.patches, *ax.collections, *ax.texts, *ax.images, *ax.tables]:
+            artist.remove()
+        if ax.legend_ is not None:
+            ax.legend_.remove()
+
+        # Undo what the previous chart may have set on the axes
+        for axis in (ax.xaxis, ax.yaxis):
+            axis.set_major_locator(AutoLocator())
+            axis.set_major_formatter(ScalarFormatter())
+        # tick_params also resets the defaults new ticks are created with
+        ax.tick_params(axis="x", labelrotation=0)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("center")
+        ax.relim()
+        ax.set_autoscale_on(True)
+        ax.set_prop_cycle(PALETTE)
+
+        ax.title.set_text(title)
+        ax.xaxis.label.set_text(x_label)
+        ax.yaxis.label.set_text(y_label)
+        return ax
+
+    def encode(self, profile: RenderProfile | str | None = None) -> EncodedImage:
+        """Lay the figure out and encode it with a rendering profile."""
+        return encode_figure(self.figure, profile)
+
+
+_local = threading.local()
+
+
+def get_template(kind: str) -> FigureTemplate:
+    """Return this thread's template for the chart type ``kind`` (see TEMPLATES)."""
+    templates = getattr(_local, "templates", None)
+    if templates is None:
+        templates = _local.templates = {}
+    template = templates.get(kind)
+    if template is None:
+        template = templates[kind] = FigureTemplate(TEMPLATES[kind])
+    return template
+
+
+def warm_templates() -> None:
+    """Build every template of this thread and draw it once, loading the fonts."""
+    for kind in TEMPLATES:
+        template = get_template(kind)
+        template.reset(title="warm-up", x_label="x", y_label="y")
+        template.canvas.draw()
+        template.reset()
+
+
+def category_positions(values: list) -> tuple[np.ndarray, list[str] | None]:
+    """Return numeric positions for ``values`` and their tick labels.
+
+    Numeric values are their own positions (labels None); anything else is
+    drawn at 0..n-1 with the values as labels.
+    """
+    if all(isinstance(value, Real) and not isinstance(value, bool) for value in values):
+        return np.asarray(values, dtype=float), None
+    return np.arange(len(values), dtype=float), [str(value) for value in values]
+
+
+def set_category_ticks(ax, positions: Sequence[float], labels: list[str], max_ticks: int | None = None) -> None:
+    """Label x ``positions`` with ``labels`` rotated, keeping at most ``max_ticks`` of them."""
+    step = max(1, -(-len(labels) // max_ticks)) if max_ticks else 1
+    ax.set_xticks(positions[::step], labels[::step])
+    ax.tick_params(axis="x", labelrotation=45)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
@@ -0,0 +1,152 @@
+"""Content-addressed LRU cache of encoded chart images, keyed by render function, spec and profile."""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from numbers import Number
+import threading
+import hashlib
+import os
+
+import numpy as np
+
+from app.tools.rendering import EncodedImage, RenderProfile, get_profile
+
+RENDER_CACHE_MAX_BYTES = int(os.getenv("CHART_RENDER_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RENDER_CACHE_ENABLED = os.getenv("CHART_RENDER_CACHE", "true").lower() == "true"
+
+# A render function draws ``spec`` and encodes it with the profile
+Render = Callable[[dict, RenderProfile], EncodedImage]
+
+
+@dataclass
+class RenderCacheStats:
+    """Hit/miss counters of a RenderCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _feed(hasher, value) -> None:
+    """Feed ``value`` to ``hasher`` unambiguously, with a fast path for numeric arrays."""
+    if isinstance(value, dict):
+        hasher.update(b"{")
+        for key in sorted(value, key=str):
+            _feed(hasher, str(key))
+            _feed(hasher, value[key])
+        hasher.update(b"}")
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        if len(value) and all(isinstance(item, Number) and not isinstance(item, bool) for item in value):
+            # Hash the float64 buffer instead of walking the numbers in Python
+            array = np.ascontiguousarray(value, dtype=np.float64)
+            hasher.update(b"a%d:" % array.size)
+            hasher.update(array.tobytes())
+        else:
+            hasher.update(b"[%d:" % len(value))
+            for item in value:
+                _feed(hasher, item)
+            hasher.update(b"]")
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        hasher.update(b"s%d:" % len(encoded))
+        hasher.update(encoded)
+    else:
+        encoded = repr(value).encode("utf-8")
+        hasher.update(b"r%d:" % len(encoded))
+        hasher.update(encoded)
+
+
+def chart_key(render: Render, spec: dict, profile: RenderProfile) -> str:
+    """Return the cache key of rendering ``spec`` with ``render`` and ``profile``."""
+    hasher = hashlib.blake2b(digest_size=16)
+    _feed(hasher, f"{render.__module__}.{render.__qualname__}")
+    _feed(hasher, spec)
+    _feed(hasher, repr(profile))
+    return hasher.hexdigest()
+
+
+class RenderCache:
+    """Byte-bounded LRU of encoded chart images."""
+
+    def __init__(self, max_bytes: int = RENDER_CACHE_MAX_BYTES, enabled: bool = RENDER_CACHE_ENABLED) -> None:
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.stats = RenderCacheStats()
+        self._images: OrderedDict[str, EncodedImage] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, render: Render, spec: dict, profile: RenderProfile | str | None = None) -> EncodedImage:
+        """Return the image of ``spec``, calling ``render`` only on a miss.
+
+        Args:
+            render: Function drawing and encoding the chart, e.g. ``render_histogram``.
+            spec: Everything the chart depends on (data, labels, styling).
+            profile: A RenderProfile or profile name, the default when None.
+
+        Returns:
+            EncodedImage: The cached or freshly rendered image.
+        """
+        profile = get_profile(profile)
+        if not self.enabled:
+            return render(spec, profile)
+
+        key = chart_key(render, spec, profile)
+        image = self.get(key)
+        if image is not None:
+            return image
+        image = render(spec, profile)
+        self.put(key, image)
+        return image
+
+    def get(self, key: str) -> EncodedImage | None:
+        """Return the cached image of ``key``, counting the hit or miss."""
+        with self._lock:
+            image = self._images.get(key)
+            if image is None:
+                self.stats.misses += 1
+                return None
+            self._images.move_to_end(key)
+            self.stats.hits += 1
+            return image
+
+    def put(self, key: str, image: EncodedImage) -> None:
+        """Cache ``image`` under ``key``, evicting the least recently used images."""
+        if len(image.data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._images.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous.data)
+            self._images[key] = image
+            self._bytes += len(image.data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= len(evicted.data)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> dict:
+        """Return the counters and current size, for logging and diagnostics."""
+        with self._lock:
+            total = self.stats.hits + self.stats.misses
+            hit_rate = self.stats.hits / total if total else 0.0
+            return {**vars(self.stats), "images": len(self._images), "bytes": self._bytes, "hit_rate": round(hit_rate, 3)}
+
+
+_render_cache: RenderCache | None = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide render cache."""
+    global _render_cache
+    with _render_cache_lock:
+        if _render_cache is None:
+            _render_cache = RenderCache()
+        return _render_cache
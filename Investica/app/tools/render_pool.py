@@ -0,0 +1,157 @@
+"""Process pool rendering charts off the event loop.
+
+Render functions must be top-level functions taking a plain, picklable
+spec and a RenderProfile, such as those in app.tools.chart_renderers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import weakref
+import asyncio
+import logging
+import os
+
+from app.tools.rendering import EncodedImage, RenderProfile, get_profile
+from app.tools.render_cache import Render, chart_key, get_render_cache
+
+RENDER_POOL_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Renders running or waiting for a worker; further callers wait for a slot
+RENDER_QUEUE_SIZE = int(os.getenv("CHART_RENDER_QUEUE_SIZE", "16"))
+# Seconds a render may take, including the start of a worker replaced after a timeout
+RENDER_TIMEOUT = float(os.getenv("CHART_RENDER_TIMEOUT", "30"))
+# Seconds to wait for a queue slot before giving up
+RENDER_QUEUE_TIMEOUT = float(os.getenv("CHART_RENDER_QUEUE_TIMEOUT", "30"))
+# "spawn" keeps workers independent of the threads of the parent process
+RENDER_START_METHOD = os.getenv("CHART_RENDER_START_METHOD", "spawn")
+
+
+def _warm_worker() -> None:
+    """Initializer of the worker processes: import matplotlib and build the figure templates."""
+    import app.tools.chart_renderers  # noqa: F401
+    from app.tools.figures import warm_templates
+
+    # Drawing text once loads the font cache, which is the slow part of a first render
+    warm_templates()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class RenderPool:
+    """Worker processes rendering charts for the coroutines of one event loop."""
+
+    def __init__(
+        self,
+        workers: int = RENDER_POOL_WORKERS,
+        queue_size: int = RENDER_QUEUE_SIZE,
+        timeout: float = RENDER_TIMEOUT,
+        queue_timeout: float = RENDER_QUEUE_TIMEOUT,
+        start_method: str = RENDER_START_METHOD,
+    ) -> None:
+        self.workers = workers
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.start_method = start_method
+        self._slots = asyncio.Semaphore(max(queue_size, workers))
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_warm_worker,
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Start every worker now rather than on the first renders."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.workers)))
+        logging.info(f"Chart render workers ready: {sorted(set(pids))}")
+
+    async def render(self, render: Render, spec: dict, profile: RenderProfile) -> EncodedImage:
+        """Run ``render(spec, profile)`` in a worker process.
+
+        Raises:
+            TimeoutError: If no queue slot frees up within ``queue_timeout``
+                seconds, or the render takes longer than ``timeout`` seconds.
+        """
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await self._slots.acquire()
+        except TimeoutError:
+            raise TimeoutError(f"Chart render queue is full, waited {self.queue_timeout:.0f} seconds")
+
+        try:
+            executor = self._get_executor()
+            future = executor.submit(render, spec, profile)
+            try:
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except TimeoutError:
+                # The worker is still busy with the render, replace the workers
+                logging.error(f"Chart render {render.__name__} timed out after {self.timeout:.0f} seconds")
+                self._recycle(executor)
+                raise TimeoutError(f"Chart render timed out after {self.timeout:.0f} seconds")
+            except BrokenProcessPool:
+                logging.error(f"A chart render worker died while running {render.__name__}")
+                self._recycle(executor)
+                raise
+        finally:
+            self._slots.release()
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Drop ``executor`` and terminate its workers; the next render starts new ones."""
+        if self._executor is executor:
+            self._executor = None
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    async def close(self) -> None:
+        """Shut the worker processes down."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+# One render pool per event loop, like the MCP session pool
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RenderPool]" = weakref.WeakKeyDictionary()
+
+
+def get_render_pool() -> RenderPool:
+    """Return the render pool of the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = RenderPool()
+    return pool
+
+
+async def render_chart(render: Render, spec: dict, profile: RenderProfile | str | None = None) -> EncodedImage:
+    """Render a chart in the worker pool, serving repeated charts from the render cache.
+
+    Args:
+        render: Top-level render function, e.g. ``render_histogram``.
+        spec: Everything the chart depends on (data, labels, styling).
+        profile: A RenderProfile or profile name, the default when None.
+
+    Returns:
+        EncodedImage: The cached or freshly rendered image.
+    """
+    profile = get_profile(profile)
+    cache = get_render_cache()
+    if not cache.enabled:
+        return await get_render_pool().render(render, spec, profile)
+
+    key = chart_key(render, spec, profile)
+    image = cache.get(key)
+    if image is None:
+        image = await get_render_pool().render(render, spec, profile)
+        cache.put(key, image)
+    return image
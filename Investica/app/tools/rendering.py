@@ -0,0 +1,117 @@
+"""Rendering profiles for chart images.
+
+A profile sets the resolution, format and size budget of a render:
+``preview`` (the default) is a small WebP for the chat, ``compact`` a
+palette-quantized PNG, ``export`` a full-resolution PNG and ``vector`` an SVG.
+"""
+
+from dataclasses import dataclass
+from matplotlib.figure import Figure
+from PIL import Image
+import logging
+import io
+import os
+
+MIME_TYPES = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+}
+# Lowest DPI a raster chart is shrunk to while trying to fit max_bytes
+MIN_DPI = 50
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """How a chart figure is encoded.
+
+    Attributes:
+        name: Name of the profile
+        dpi: Resolution of raster output
+        format: "png", "webp" or "svg"
+        quality: Lossy WebP quality (1-100)
+        quantize_colors: Reduce PNG output to a palette of this many colors
+        max_bytes: Size budget; raster output is re-rendered at lower DPI until it fits
+        tight: Crop the figure to its content (costs an extra draw)
+    """
+
+    name: str
+    dpi: int = 100
+    format: str = "webp"
+    quality: int = 80
+    quantize_colors: int | None = None
+    max_bytes: int | None = None
+    tight: bool = False
+
+    @property
+    def mime_type(self) -> str:
+        return MIME_TYPES[self.format]
+
+
+PROFILES = {
+    "preview": RenderProfile("preview", dpi=100, format="webp", quality=80, max_bytes=150_000),
+    "compact": RenderProfile("compact", dpi=80, format="png", quantize_colors=64, max_bytes=60_000),
+    "export": RenderProfile("export", dpi=300, format="png", tight=True),
+    "vector": RenderProfile("vector", format="svg", tight=True),
+}
+DEFAULT_PROFILE = os.getenv("CHART_RENDER_PROFILE", "preview")
+
+
+@dataclass(frozen=True)
+class EncodedImage:
+    """An encoded chart image."""
+
+    data: bytes
+    mime_type: str
+    dpi: int
+    profile: str
+
+
+def get_profile(profile: RenderProfile | str | None = None) -> RenderProfile:
+    """Resolve a profile name (or None for the default) to a RenderProfile."""
+    if isinstance(profile, RenderProfile):
+        return profile
+    name = (profile or DEFAULT_PROFILE).lower()
+    if name not in PROFILES:
+        logging.warning(f"Unknown chart profile {name!r}, using {DEFAULT_PROFILE}")
+        name = DEFAULT_PROFILE if DEFAULT_PROFILE in PROFILES else "preview"
+    return PROFILES[name]
+
+
+def _save(fig: Figure, profile: RenderProfile, dpi: int) -> bytes:
+    buffer = io.BytesIO()
+    bbox = "tight" if profile.tight else None
+    if profile.format == "webp":
+        fig.savefig(buffer, format="webp", dpi=dpi, bbox_inches=bbox, pil_kwargs={"quality": profile.quality, "method": 4})
+    elif profile.format == "png" and profile.quantize_colors:
+        fig.savefig(buffer, format="png", dpi=dpi, bbox_inches=bbox)
+        image = Image.open(io.BytesIO(buffer.getvalue())).convert("RGB")
+        buffer = io.BytesIO()
+        image.quantize(profile.quantize_colors, method=Image.Quantize.MEDIANCUT).save(buffer, format="png", optimize=True)
+    else:
+        fig.savefig(buffer, format=profile.format, dpi=dpi, bbox_inches=bbox)
+    return buffer.getvalue()
+
+
+def encode_figure(fig: Figure, profile: RenderProfile | str | None = None) -> EncodedImage:
+    """Encode a figure with a rendering profile.
+
+    Args:
+        fig: The figure to encode.
+        profile: A RenderProfile or the name of one of PROFILES, the default
+            (CHART_RENDER_PROFILE, "preview") when None.
+
+    Returns:
+        EncodedImage: The image bytes with their MIME type and the DPI used,
+        which is below the profile's when it had to shrink to fit max_bytes.
+    """
+    profile = get_profile(profile)
+    dpi = profile.dpi
+    data = _save(fig, profile, dpi)
+    # Vector output does not get smaller with the DPI
+    while profile.max_bytes and len(data) > profile.max_bytes and profile.format != "svg" and dpi > MIN_DPI:
+        dpi = max(MIN_DPI, int(dpi * 0.75))
+        data = _save(fig, profile, dpi)
+    if profile.max_bytes and len(data) > profile.max_bytes:
+        logging.warning(f"Chart is {len(data)} bytes, above the {profile.name} budget of {profile.max_bytes}")
+    return EncodedImage(data, profile.mime_type, dpi, profile.name)
@@ -1,10 +1,12 @@
 from app.utils.model import model
-from app.utils.mcp_client import MCPClient 
+from app.utils.mcp_client import MCPClient, MCPSessionPool, get_mcp_pool
 from app.utils.prompts import CHART_AGENT_SYSTEM_PROMPT, ZERODHA_AGENT_SYSTEM_PROMPT, FINANCIAL_ANALYST_SYSTEM_PROMPT
 
 __all__ = [
     model,
     MCPClient,
+    MCPSessionPool,
+    get_mcp_pool,
     CHART_AGENT_SYSTEM_PROMPT,
     ZERODHA_AGENT_SYSTEM_PROMPT,
     FINANCIAL_ANALYST_SYSTEM_PROMPT
@@ -2,62 +2,327 @@ from pydantic_ai import RunContext, Tool as PydanticTool
 from pydantic_ai.tools import ToolDefinition
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from mcp.types import Tool as MCPTool
-from contextlib import AsyncExitStack
-from typing import Any, List
+from mcp.types import Tool as MCPTool, CallToolResult, ServerNotification, ToolListChangedNotification
+from mcp.shared.exceptions import McpError
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, List
+import functools
+import weakref
+import random
+import anyio
+import httpx
 import asyncio
+import hashlib
 import logging
+import pathlib
 import shutil
 import json
+import time
+import sys
 import os
 
 logging.basicConfig(
     level=logging.ERROR, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Session pool tuning (see MCPSessionPool)
+MCP_POOL_MAX_SIZE = int(os.getenv("MCP_POOL_MAX_SIZE", "8"))
+MCP_POOL_IDLE_TIMEOUT = float(os.getenv("MCP_POOL_IDLE_TIMEOUT", "600"))
+MCP_POOL_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_POOL_HEALTH_CHECK_INTERVAL", "30"))
+MCP_POOL_CONNECT_TIMEOUT = float(os.getenv("MCP_POOL_CONNECT_TIMEOUT", "60"))
+MCP_POOL_WAIT_TIMEOUT = float(os.getenv("MCP_POOL_WAIT_TIMEOUT", "30"))
+# Per-session connections (one per conversation) are capped and aged separately;
+# evicting one drops the login it holds, so they are kept around for longer
+MCP_POOL_MAX_SESSIONS = int(os.getenv("MCP_POOL_MAX_SESSIONS", "16"))
+MCP_POOL_SESSION_IDLE_TIMEOUT = float(os.getenv("MCP_POOL_SESSION_IDLE_TIMEOUT", "1800"))
+MCP_SERVER_START_TIMEOUT = float(os.getenv("MCP_SERVER_START_TIMEOUT", "60"))
+
+# Tool call tuning (see MCPServer.create_tool_instance)
+MCP_MAX_CONCURRENT_CALLS = int(os.getenv("MCP_MAX_CONCURRENT_CALLS", "4"))
+MCP_TOOL_CALL_TIMEOUT = float(os.getenv("MCP_TOOL_CALL_TIMEOUT", "60"))
+MCP_TOOL_RETRIES = int(os.getenv("MCP_TOOL_RETRIES", "2"))
+MCP_TOOL_RETRY_BACKOFF = float(os.getenv("MCP_TOOL_RETRY_BACKOFF", "0.5"))
+# Tools of servers that do not annotate them are treated as reads when named like one
+READ_TOOL_PREFIXES = ("get_", "list_", "search_", "fetch_", "read_", "describe_")
+
+# Tool catalog cache tuning (see ToolCatalogCache)
+MCP_TOOL_CACHE_TTL = float(os.getenv("MCP_TOOL_CACHE_TTL", "3600"))
+MCP_TOOL_CACHE_DIR = os.getenv("MCP_TOOL_CACHE_DIR") or None
+
+
+class ToolCatalogCache:
+    """TTL-bounded cache of the tool list advertised by each MCP server.
+
+    Entries are keyed by server name plus a hash of its configuration, so
+    editing mcp_config.json never serves a stale catalog. When ``snapshot_dir``
+    is set the catalog is also written to disk and survives restarts.
+    """
+
+    def __init__(self, ttl: float = MCP_TOOL_CACHE_TTL, snapshot_dir: str | None = MCP_TOOL_CACHE_DIR) -> None:
+        self.ttl = ttl
+        self.snapshot_dir = pathlib.Path(snapshot_dir) if snapshot_dir else None
+        self._entries: dict[str, tuple[float, List[MCPTool]]] = {}
+
+    @staticmethod
+    def key(name: str, config: dict[str, Any]) -> str:
+        """Build the cache key for a server from its name and configuration."""
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+        return f"{name}-{digest}"
+
+    def get(self, key: str) -> List[MCPTool] | None:
+        """Return the cached tools for ``key``, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load_snapshot(key)
+            if entry is None:
+                return None
+            self._entries[key] = entry
+
+        saved_at, tools = entry
+        if time.time() - saved_at >= self.ttl:
+            self.invalidate(key)
+            return None
+        return tools
+
+    def put(self, key: str, tools: List[MCPTool]) -> None:
+        """Store the tools for ``key`` in memory and, if enabled, on disk."""
+        saved_at = time.time()
+        self._entries[key] = (saved_at, tools)
+        if self.snapshot_dir is None:
+            return
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            snapshot = {
+                "saved_at": saved_at,
+                "tools": [tool.model_dump(mode="json", by_alias=True) for tool in tools],
+            }
+            tmp_path = self._snapshot_path(key).with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(snapshot))
+            tmp_path.replace(self._snapshot_path(key))
+        except Exception as e:
+            logging.warning(f"Could not write tool catalog snapshot for {key}: {e}")
+
+    def invalidate(self, key: str) -> None:
+        """Drop the cached tools for ``key`` from memory and disk."""
+        self._entries.pop(key, None)
+        if self.snapshot_dir is not None:
+            self._snapshot_path(key).unlink(missing_ok=True)
+
+    def _snapshot_path(self, key: str) -> pathlib.Path:
+        return self.snapshot_dir / f"{key}.json"
+
+    def _load_snapshot(self, key: str) -> tuple[float, List[MCPTool]] | None:
+        if self.snapshot_dir is None:
+            return None
+        path = self._snapshot_path(key)
+        if not path.exists():
+            return None
+        try:
+            snapshot = json.loads(path.read_text())
+            tools = [MCPTool.model_validate(tool) for tool in snapshot["tools"]]
+            return snapshot["saved_at"], tools
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable tool catalog snapshot {path}: {e}")
+            return None
+
+
+tool_catalog = ToolCatalogCache()
+
+
+class ToolLatencyStats:
+    """Latency histograms of MCP tool calls, keyed by "server/tool".
+
+    Latencies are wall times as seen by the agent, including the wait for a
+    free call slot on the server and any retries.
+    """
+
+    # Upper bounds of the histogram buckets, in seconds
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+
+    def __init__(self) -> None:
+        self._tools: dict[str, dict[str, Any]] = {}
+
+    def observe(self, tool: str, seconds: float, ok: bool = True, retries: int = 0) -> None:
+        """Record one call of ``tool`` that took ``seconds``."""
+        stats = self._tools.setdefault(
+            tool, {"count": 0, "errors": 0, "retries": 0, "total": 0.0, "buckets": [0] * len(self.BUCKETS)}
+        )
+        stats["count"] += 1
+        stats["errors"] += 0 if ok else 1
+        stats["retries"] += retries
+        stats["total"] += seconds
+        stats["buckets"][next(i for i, bound in enumerate(self.BUCKETS) if seconds <= bound)] += 1
+
+    def _percentile(self, buckets: list[int], count: int, quantile: float) -> float:
+        seen = 0
+        for bound, hits in zip(self.BUCKETS, buckets):
+            seen += hits
+            if seen >= quantile * count:
+                return bound
+        return self.BUCKETS[-1]
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return count, errors, mean and bucket-resolution p50/p95 per tool, plus the histogram."""
+        return {
+            tool: {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "retries": stats["retries"],
+                "mean": stats["total"] / stats["count"],
+                "p50": self._percentile(stats["buckets"], stats["count"], 0.5),
+                "p95": self._percentile(stats["buckets"], stats["count"], 0.95),
+                "histogram": {f"le_{bound:g}": hits for bound, hits in zip(self.BUCKETS, stats["buckets"])},
+            }
+            for tool, stats in self._tools.items()
+        }
+
+
+tool_latency = ToolLatencyStats()
+
+
+def is_retryable_tool(tool: MCPTool) -> bool:
+    """Whether calling ``tool`` again is safe: it only reads, or says it is idempotent."""
+    annotations = tool.annotations
+    if annotations is not None and (annotations.readOnlyHint or annotations.idempotentHint):
+        return True
+    if annotations is not None and annotations.readOnlyHint is False:
+        return False
+    return tool.name.startswith(READ_TOOL_PREFIXES)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether a failed tool call left the server's session unusable."""
+    return isinstance(
+        error, (ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+    )
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a failed tool call may succeed when tried again (after a reconnect for connection errors)."""
+    if isinstance(error, McpError):
+        return error.error.code == httpx.codes.REQUEST_TIMEOUT
+    return isinstance(error, TimeoutError) or is_connection_error(error)
+
 class MCPClient:
     """Manages connections to one or more MCP servers based on mcp_config.json"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        pool: "MCPSessionPool | None" = None,
+        start_timeout: float = MCP_SERVER_START_TIMEOUT,
+        session_key: str | None = None,
+    ) -> None:
         self.servers: List[MCPServer] = []
         self.config: dict[str, Any] = {}
         self.tools: List[Any] = []
         self.exit_stack = AsyncExitStack()
+        # When a pool is given, servers are borrowed from it instead of spawned
+        self.pool = pool
+        self._owns_pool = False
+        self.start_timeout = start_timeout
+        # Servers marked "per_session" in mcp_config.json (e.g. ones holding a
+        # login) get their own pooled connection per key, e.g. per thread id
+        self.session_key = session_key
+        # Diagnostics from the last call to start(), keyed by server name
+        self.startup_timings: dict[str, float] = {}
+        self.startup_errors: dict[str, str] = {}
 
     def load_servers(self, config_path: str) -> None:
         """Load server configuration from a JSON file (typically mcp_config.json)
         and creates an instance of each server (no active connection until 'start' though).
 
+        A server's optional ``cwd`` is resolved relative to the config file,
+        and ``"per_session": true`` gives every session key its own connection.
+
         Args:
             config_path: Path to the JSON configuration file.
         """
         with open(config_path, "r") as config_file:
             self.config = json.load(config_file)
 
+        # A relative "cwd" is relative to the config file, not to where the app was started
+        config_dir = os.path.dirname(os.path.abspath(config_path))
+        for config in self.config["mcpServers"].values():
+            if config.get("cwd"):
+                config["cwd"] = os.path.normpath(os.path.join(config_dir, config["cwd"]))
+
         self.servers = [MCPServer(name, config) for name, config in self.config["mcpServers"].items()]
 
-    async def start(self) -> List[PydanticTool]:
-        """Starts each MCP server and returns the tools for each server formatted for Pydantic AI."""
+    async def start(self, allow_partial: bool = True) -> List[PydanticTool]:
+        """Starts every MCP server concurrently and returns their tools formatted for Pydantic AI.
+
+        Each server gets ``start_timeout`` seconds to connect and list its tools,
+        so a cold start takes as long as the slowest server. Per-server wall
+        times are recorded in ``startup_timings`` and failures in ``startup_errors``.
+
+        Args:
+            allow_partial: Return the tools of the servers that did start even if
+                others failed. When False, any failure returns no tools at all.
+        """
+        if self.pool is None:
+            # Without a shared pool the client gets a private one it closes on cleanup
+            self.pool = MCPSessionPool(max_size=max(1, len(self.config["mcpServers"])))
+            self._owns_pool = True
+
         self.tools = []
-        for server in self.servers:
-            try:
-                await server.initialize()
-                tools = await server.create_pydantic_ai_tools()
-                self.tools += tools
-            except Exception as e:
-                logging.error(f"Failed to initialize server: {e}")
-                await self.cleanup_servers()
-                return []
+        self.startup_timings = {}
+        self.startup_errors = {}
+        results = await asyncio.gather(
+            *(self._start_server(name, config) for name, config in self.config["mcpServers"].items())
+        )
+
+        self.servers = [server for server, _ in filter(None, results)]
+        if self.startup_errors and not allow_partial:
+            await self.cleanup_servers()
+            return []
 
+        for result in results:
+            if result is not None:
+                self.tools += result[1]
         return self.tools
 
+    async def _start_server(self, name: str, config: dict[str, Any]) -> tuple["MCPServer", List[PydanticTool]] | None:
+        """Borrow one server from the pool and build its tools, recording timing and errors."""
+        started = time.perf_counter()
+        server = None
+        try:
+            server = await asyncio.wait_for(
+                self.pool.acquire(name, config, self._session_key(config)), timeout=self.start_timeout
+            )
+            remaining = max(0.0, self.start_timeout - (time.perf_counter() - started))
+            tools = await asyncio.wait_for(server.create_pydantic_ai_tools(), timeout=remaining)
+            return server, tools
+        except Exception as e:
+            self.startup_errors[name] = str(e) or type(e).__name__
+            logging.error(f"Failed to initialize server {name}: {self.startup_errors[name]}")
+            if server is not None:
+                await self.pool.release(name, self._session_key(config))
+            return None
+        finally:
+            self.startup_timings[name] = time.perf_counter() - started
+
+    def _session_key(self, config: dict[str, Any]) -> str | None:
+        """Return the pool session key of a server, None when it is shared."""
+        return self.session_key if config.get("per_session") else None
+
     async def cleanup_servers(self) -> None:
         """Clean up all servers properly."""
+        if self.pool is None:
+            return
+
+        # Borrowed servers are handed back; they are only closed with the pool
         for server in self.servers:
+            await self.pool.release(server.name, self._session_key(server.config))
+        self.servers = []
+
+        if self._owns_pool:
             try:
-                await server.cleanup()
+                await self.pool.close()
             except Exception as e:
-                logging.warning(f"Warning during cleanup of server {server.name}: {e}")
+                logging.warning(f"Warning during cleanup of servers: {e}")
+            self.pool = None
+            self._owns_pool = False
 
     async def cleanup(self) -> None:
         """Clean up all resources including the exit stack."""
@@ -80,14 +345,23 @@ class MCPServer:
         self.session: ClientSession | None = None
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self.exit_stack: AsyncExitStack = AsyncExitStack()
+        self.catalog_key: str = ToolCatalogCache.key(name, config)
+        # Pydantic AI tools built from the catalog they were created from
+        self._pydantic_tools: tuple[List[MCPTool], List[PydanticTool]] | None = None
+        # In-flight tool calls are multiplexed over the one session, up to this many at once
+        self._call_slots: asyncio.Semaphore = asyncio.Semaphore(MCP_MAX_CONCURRENT_CALLS)
+        self.call_timeout: timedelta = timedelta(seconds=MCP_TOOL_CALL_TIMEOUT)
+        # Set by the pool owning the server, replaces a session found dead mid-call
+        self.reconnect: Callable[[ClientSession | None], Awaitable[None]] | None = None
 
     async def initialize(self) -> None:
         """Initialize the server connection."""
-        command = (
-            shutil.which("npx")
-            if self.config["command"] == "npx"
-            else self.config["command"]
-        )
+        command = self.config["command"]
+        if command == "npx":
+            command = shutil.which("npx")
+        elif command == "python":
+            # The interpreter running the app, whatever "python" is on PATH
+            command = sys.executable
         if command is None:
             raise ValueError("The command must be a valid string and cannot be None.")
 
@@ -97,6 +371,7 @@ class MCPServer:
             env=self.config["env"]
             if self.config.get("env")
             else None,
+            cwd=self.config.get("cwd"),
         )
         try:
             stdio_transport = await self.exit_stack.enter_async_context(
@@ -104,7 +379,7 @@ class MCPServer:
             )
             read, write = stdio_transport
             session = await self.exit_stack.enter_async_context(
-                ClientSession(read, write)
+                ClientSession(read, write, message_handler=self._handle_message)
             )
             await session.initialize()
             self.session = session
@@ -114,14 +389,67 @@ class MCPServer:
             raise
 
     async def create_pydantic_ai_tools(self) -> List[PydanticTool]:
-        """Convert MCP tools to pydantic_ai Tools."""
-        tools = (await self.session.list_tools()).tools
-        return [self.create_tool_instance(tool) for tool in tools]            
+        """Convert MCP tools to pydantic_ai Tools.
+
+        The tool list comes from the shared catalog cache when possible, and the
+        Pydantic AI tools are rebuilt only when that catalog changes.
+        """
+        tools = tool_catalog.get(self.catalog_key)
+        if tools is None:
+            tools = (await self.session.list_tools()).tools
+            tool_catalog.put(self.catalog_key, tools)
+
+        if self._pydantic_tools is None or self._pydantic_tools[0] is not tools:
+            self._pydantic_tools = (tools, [self.create_tool_instance(tool) for tool in tools])
+        return list(self._pydantic_tools[1])
+
+    async def _handle_message(self, message: Any) -> None:
+        """Drop the cached catalog when the server announces its tools changed."""
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            logging.info(f"Tool list changed on server {self.name}, invalidating catalog")
+            tool_catalog.invalidate(self.catalog_key)
+            self._pydantic_tools = None
 
     def create_tool_instance(self, tool: MCPTool) -> PydanticTool:
-        """Initialize a Pydantic AI Tool from an MCP Tool."""
+        """Initialize a Pydantic AI Tool from an MCP Tool.
+
+        Calls share the server's call slots and time out after ``call_timeout``.
+        Tools that are safe to repeat (see is_retryable_tool) are retried with
+        exponential backoff on timeouts and broken connections, the latter
+        only once the owning pool has reconnected the server. Every call is
+        recorded in ``tool_latency``.
+        """
+        attempts = 1 + (MCP_TOOL_RETRIES if is_retryable_tool(tool) else 0)
+        stats_key = f"{self.name}/{tool.name}"
+
         async def execute_tool(**kwargs: Any) -> Any:
-            return await self.session.call_tool(tool.name, arguments=kwargs)
+            started = time.perf_counter()
+            session = None
+            broken = False
+            for attempt in range(attempts):
+                try:
+                    if broken:
+                        await self.reconnect(session)
+                    async with self._call_slots:
+                        # Read the session per attempt, it may have been reconnected
+                        session = self.session
+                        if session is None:
+                            raise ConnectionError(f"MCP server {self.name} is not connected")
+                        result: CallToolResult = await session.call_tool(
+                            tool.name, arguments=kwargs, read_timeout_seconds=self.call_timeout
+                        )
+                except Exception as e:
+                    broken = is_connection_error(e)
+                    # A dead session only comes back through the pool, never retry on it as is
+                    if attempt + 1 >= attempts or not is_transient_error(e) or (broken and self.reconnect is None):
+                        tool_latency.observe(stats_key, time.perf_counter() - started, ok=False, retries=attempt)
+                        raise
+                    delay = MCP_TOOL_RETRY_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.0)
+                    logging.warning(f"Tool {stats_key} failed ({e or type(e).__name__}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                else:
+                    tool_latency.observe(stats_key, time.perf_counter() - started, ok=not result.isError, retries=attempt)
+                    return result
 
         async def prepare_tool(ctx: RunContext, tool_def: ToolDefinition) -> ToolDefinition | None:
             tool_def.parameters_json_schema = tool.inputSchema
@@ -143,4 +471,314 @@ class MCPServer:
                 self.session = None
                 self.stdio_context = None
             except Exception as e:
-                logging.error(f"Error during cleanup of server {self.name}: {e}")  
\ No newline at end of file
+                logging.error(f"Error during cleanup of server {self.name}: {e}")
+
+
+def pool_key(name: str, session_key: str | None = None) -> str:
+    """Return the pool entry key of server ``name``, shared when ``session_key`` is None."""
+    return name if session_key is None else f"{name}:{session_key}"
+
+
+class _PooledServer:
+    """A pool entry owning one MCPServer connection.
+
+    The stdio transport and client session are anyio contexts that must be
+    entered and exited from the same task, so every connection is driven by
+    its own long-lived owner task rather than by whichever caller borrowed it.
+    """
+
+    def __init__(self, server: MCPServer, per_session: bool = False) -> None:
+        self.server: MCPServer = server
+        self.per_session: bool = per_session
+        self.in_use: int = 0
+        self.last_used: float = time.monotonic()
+        self.last_checked: float = time.monotonic()
+        self.task: asyncio.Task | None = None
+        self._ready: asyncio.Event = asyncio.Event()
+        self._closing: asyncio.Event = asyncio.Event()
+        self._error: BaseException | None = None
+
+    async def connect(self, timeout: float) -> None:
+        """Start the owner task and wait until the session is initialized."""
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error = None
+        self.task = asyncio.create_task(self._run(), name=f"mcp-pool:{self.server.name}")
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise TimeoutError(f"Timed out connecting to MCP server {self.server.name}")
+        if self._error is not None:
+            raise self._error
+        self.last_checked = time.monotonic()
+
+    async def _run(self) -> None:
+        try:
+            await self.server.initialize()
+        except asyncio.CancelledError:
+            await self.server.cleanup()
+            raise
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+
+        self._ready.set()
+        try:
+            await self._closing.wait()
+        finally:
+            await self.server.cleanup()
+
+    async def close(self) -> None:
+        """Signal the owner task to tear the connection down and wait for it."""
+        self._closing.set()
+        if self.task is not None:
+            if not self._ready.is_set():
+                # Still handshaking, nothing to wait for
+                self.task.cancel()
+            (result,) = await asyncio.gather(self.task, return_exceptions=True)
+            if isinstance(result, Exception):
+                logging.warning(f"Warning during cleanup of pooled server {self.server.name}: {result}")
+            self.task = None
+
+    async def is_healthy(self, timeout: float) -> bool:
+        """Ping the server; a dead transport or a missing session counts as unhealthy."""
+        if self.task is None or self.task.done() or self.server.session is None:
+            return False
+        try:
+            await asyncio.wait_for(self.server.session.send_ping(), timeout=timeout)
+        except Exception as e:
+            logging.warning(f"Health check failed for MCP server {self.server.name}: {e}")
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+
+class MCPSessionPool:
+    """Long-lived pool of initialized MCP server connections keyed by server name.
+
+    Borrowers get an MCPServer whose session is already initialized. Idle
+    connections are evicted after ``idle_timeout`` seconds, connections are
+    pinged at most every ``health_check_interval`` seconds when borrowed, and
+    a failed check transparently reconnects the same MCPServer object so tools
+    that were built from it keep working.
+
+    A server borrowed with a ``session_key`` gets a connection of its own for
+    that key, so state the server keeps per connection (such as a broker
+    login) is never shared between users. Those connections are capped by
+    ``max_sessions`` and evicted after ``session_idle_timeout`` instead, so
+    conversations cannot crowd out the shared servers. When every slot is
+    borrowed, ``acquire`` waits up to ``wait_timeout`` seconds for one to be
+    released.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MCP_POOL_MAX_SIZE,
+        idle_timeout: float = MCP_POOL_IDLE_TIMEOUT,
+        health_check_interval: float = MCP_POOL_HEALTH_CHECK_INTERVAL,
+        connect_timeout: float = MCP_POOL_CONNECT_TIMEOUT,
+        max_sessions: int = MCP_POOL_MAX_SESSIONS,
+        session_idle_timeout: float = MCP_POOL_SESSION_IDLE_TIMEOUT,
+        wait_timeout: float = MCP_POOL_WAIT_TIMEOUT,
+    ) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self.max_sessions = max_sessions
+        self.session_idle_timeout = session_idle_timeout
+        self.wait_timeout = wait_timeout
+        self._entries: dict[str, _PooledServer] = {}
+        # Held only while a borrow of that key is in flight, so they never pile up
+        self._locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        self._lock = asyncio.Lock()
+        # Signalled whenever a borrow ends or an entry goes away
+        self._room = asyncio.Condition(self._lock)
+        self._reaper: asyncio.Task | None = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def acquire(self, name: str, config: dict[str, Any], session_key: str | None = None) -> MCPServer:
+        """Borrow the server ``name``, connecting or reconnecting it if needed.
+
+        Args:
+            name: Server name as found under "mcpServers" in mcp_config.json.
+            config: The server's configuration block from mcp_config.json.
+            session_key: Borrow the connection of this session (e.g. a thread
+                id) instead of the shared one.
+
+        Returns:
+            MCPServer: A server with an initialized session. Hand it back with
+            ``release`` once done.
+        """
+        self._ensure_reaper()
+        key = pool_key(name, session_key)
+        async with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and entry.server.config != config:
+                # Configuration changed since the connection was made
+                await self._discard(key)
+                entry = None
+
+            if entry is None:
+                per_session = session_key is not None
+                async with self._room:
+                    await self._make_room(per_session)
+                    entry = _PooledServer(MCPServer(name, config), per_session)
+                    entry.server.reconnect = functools.partial(self.reconnect, key)
+                    self._entries[key] = entry
+                # Count the borrow up front so the entry is not evicted mid-connect
+                entry.in_use += 1
+                try:
+                    await entry.connect(self.connect_timeout)
+                except BaseException:
+                    self._entries.pop(key, None)
+                    await entry.close()
+                    await self._notify_room()
+                    raise
+            else:
+                entry.in_use += 1
+                try:
+                    if time.monotonic() - entry.last_checked >= self.health_check_interval:
+                        if not await entry.is_healthy(self.connect_timeout):
+                            logging.warning(f"Reconnecting MCP server {key}")
+                            await entry.close()
+                            await entry.connect(self.connect_timeout)
+                except BaseException:
+                    # A failed or cancelled check must not leave the entry borrowed forever
+                    entry.in_use -= 1
+                    raise
+
+            entry.last_used = time.monotonic()
+            return entry.server
+
+    async def release(self, name: str, session_key: str | None = None) -> None:
+        """Hand a borrowed server back to the pool."""
+        entry = self._entries.get(pool_key(name, session_key))
+        if entry is None:
+            return
+        entry.in_use = max(0, entry.in_use - 1)
+        entry.last_used = time.monotonic()
+        await self._notify_room()
+
+    async def reconnect(self, key: str, dead: ClientSession | None) -> None:
+        """Reconnect the borrowed entry ``key`` after a tool call found its session ``dead``.
+
+        Concurrent calls that hit the same dead session reconnect it only once.
+        """
+        async with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is None or entry.server.session is not dead:
+                # Discarded, or already reconnected by another call
+                return
+            logging.warning(f"Reconnecting MCP server {key} after a broken tool call")
+            await entry.close()
+            await entry.connect(self.connect_timeout)
+
+    @asynccontextmanager
+    async def session(
+        self, name: str, config: dict[str, Any], session_key: str | None = None
+    ) -> AsyncIterator[ClientSession]:
+        """Borrow the initialized ``ClientSession`` of a server for the duration of the block."""
+        server = await self.acquire(name, config, session_key)
+        try:
+            yield server.session
+        finally:
+            await self.release(name, session_key)
+
+    async def evict_idle(self) -> None:
+        """Close every connection that has been idle for longer than its idle timeout."""
+        now = time.monotonic()
+        for name, entry in list(self._entries.items()):
+            timeout = self.session_idle_timeout if entry.per_session else self.idle_timeout
+            if entry.in_use == 0 and now - entry.last_used >= timeout:
+                if entry.per_session:
+                    logging.warning(f"Evicting idle MCP session {name}; its login is lost and must be redone")
+                else:
+                    logging.info(f"Evicting idle MCP server {name}")
+                await self._discard(name)
+
+    async def close(self) -> None:
+        """Close every pooled connection and stop the idle reaper."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for name in list(self._entries):
+            await self._discard(name)
+
+    async def _make_room(self, per_session: bool) -> None:
+        """Free a slot for a new shared or per-session connection; called holding ``_room``.
+
+        Evicts the least recently used idle connection of the same kind when
+        that kind is at its limit, waiting for a release if all are borrowed.
+
+        Raises:
+            TimeoutError: If no slot frees up within ``wait_timeout`` seconds.
+        """
+        limit = self.max_sessions if per_session else self.max_size
+
+        def entries() -> list[tuple[str, _PooledServer]]:
+            return [(name, entry) for name, entry in self._entries.items() if entry.per_session == per_session]
+
+        def has_room() -> bool:
+            current = entries()
+            return len(current) < limit or any(entry.in_use == 0 for _, entry in current)
+
+        try:
+            await asyncio.wait_for(self._room.wait_for(has_room), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            kind = "per-session connections" if per_session else "servers"
+            raise TimeoutError(f"MCP session pool is full ({limit} {kind} in use)")
+
+        current = entries()
+        if len(current) < limit:
+            return
+        _, name = min((entry.last_used, name) for name, entry in current if entry.in_use == 0)
+        await self._discard(name)
+
+    async def _notify_room(self) -> None:
+        async with self._room:
+            self._room.notify_all()
+
+    def _key_lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    async def _discard(self, name: str) -> None:
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            await entry.close()
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap(), name="mcp-pool-reaper")
+
+    async def _reap(self) -> None:
+        interval = max(1.0, min(self.idle_timeout, self.session_idle_timeout, self.health_check_interval))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logging.warning(f"Warning during MCP pool eviction: {e}")
+
+
+# One pool per event loop: sessions are bound to the loop they were opened on
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool]" = weakref.WeakKeyDictionary()
+
+
+def get_mcp_pool() -> MCPSessionPool:
+    """Return the process-wide MCP session pool for the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = MCPSessionPool()
+    return pool
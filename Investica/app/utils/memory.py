@@ -0,0 +1,111 @@
+"""Bounded conversation memory for the agentic graph: token counting, budgeted history and summaries."""
+
+from importlib.util import find_spec
+import os
+
+# Token budget of the whole thread before older messages are summarized
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "6000"))
+# Share of the budget kept verbatim (most recent messages) when summarizing
+MEMORY_KEEP_RECENT_TOKENS = int(os.getenv("MEMORY_KEEP_RECENT_TOKENS", "2000"))
+# Token budget of the conversation pasted into each node's prompt
+NODE_TOKEN_BUDGETS = {
+    "router": int(os.getenv("MEMORY_ROUTER_BUDGET", "1500")),
+    "specialist": int(os.getenv("MEMORY_SPECIALIST_BUDGET", "3000")),
+    "end_conversation": int(os.getenv("MEMORY_END_CONVERSATION_BUDGET", "6000")),
+}
+
+if find_spec("tiktoken") is not None:
+    import tiktoken
+
+    _encoding = tiktoken.get_encoding("o200k_base")
+
+    def count_tokens(text: str) -> int:
+        """Count the tokens of ``text``."""
+        return len(_encoding.encode(text, disallowed_special=()))
+else:
+    def count_tokens(text: str) -> int:
+        """Estimate the tokens of ``text`` (about four characters per token)."""
+        return len(text) // 4 + 1
+
+
+def merge_messages(existing: list[dict], new: list[dict]) -> list[dict]:
+    """Reducer for AgentState.messages.
+
+    Messages are appended, except a summary message carrying ``summary_of``:
+    it replaces that many messages at the start of the list, which keeps the
+    state (and every checkpoint of it) bounded.
+    """
+    merged = list(existing)
+    for message in new:
+        if "summary_of" in message:
+            merged = [message] + merged[message["summary_of"]:]
+        else:
+            merged.append(message)
+    return merged
+
+
+def render_message(message: dict) -> str:
+    return f"{message.get('role', 'unknown')}: {message.get('content', '')}"
+
+
+def message_tokens(message: dict) -> int:
+    return count_tokens(render_message(message))
+
+
+def render_window(messages: list[dict], budget: int) -> str:
+    """Render the most recent messages that fit ``budget`` tokens, oldest first.
+
+    A leading summary message is always kept so older context is not lost;
+    the last message is always kept even when it alone exceeds the budget.
+    """
+    summary = messages[0] if messages and "summary_of" in messages[0] else None
+    recent = messages[1:] if summary else messages
+    used = message_tokens(summary) if summary else 0
+
+    window: list[dict] = []
+    for message in reversed(recent):
+        tokens = message_tokens(message)
+        if window and used + tokens > budget:
+            break
+        window.append(message)
+        used += tokens
+
+    window.reverse()
+    if summary:
+        window.insert(0, summary)
+    return "\n".join(render_message(message) for message in window)
+
+
+def split_for_summary(
+    messages: list[dict],
+    budget: int = MEMORY_TOKEN_BUDGET,
+    keep_recent: int = MEMORY_KEEP_RECENT_TOKENS,
+) -> int:
+    """Return how many leading messages to fold into a summary, 0 if none.
+
+    Nothing is folded while the thread fits ``budget``. Otherwise the most
+    recent messages worth ``keep_recent`` tokens stay verbatim and
+    everything before them (including an earlier summary) is folded.
+    """
+    if sum(message_tokens(message) for message in messages) <= budget:
+        return 0
+
+    kept_tokens = 0
+    keep_from = len(messages)
+    for index in range(len(messages) - 1, -1, -1):
+        kept_tokens += message_tokens(messages[index])
+        if kept_tokens > keep_recent and keep_from < len(messages):
+            break
+        keep_from = index
+
+    # Folding a lone message (or a lone previous summary) gains nothing
+    return keep_from if keep_from >= 2 else 0
+
+
+def summary_message(summary: str, summary_of: int) -> dict:
+    """Build the message that replaces the first ``summary_of`` messages."""
+    return {
+        "role": "system",
+        "content": f"Summary of the earlier conversation: {summary}",
+        "summary_of": summary_of,
+    }
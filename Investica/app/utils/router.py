@@ -0,0 +1,141 @@
+"""Rule-based fast path for routing in the agentic graph.
+
+Most user messages are unambiguous: a request about holdings or orders
+goes to the Zerodha agent, one about company fundamentals to the financial
+analyst (or both at once when it mentions both). Those cases are decided
+here from the last message in microseconds; only when the rules are not
+confident does the graph fall back to the router LLM. Whether a specialist
+answer needs a follow-up round is never decided by rules: ``should_stop``
+and the router LLM make that call.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+import logging
+import re
+import os
+
+# Minimum confidence for a rule-based decision to skip the LLM router
+ROUTER_FAST_PATH_CONFIDENCE = float(os.getenv("ROUTER_FAST_PATH_CONFIDENCE", "0.8"))
+# Maximum rounds of specialist agents per user turn before the turn is wrapped up
+ROUTER_MAX_HOPS = int(os.getenv("ROUTER_MAX_HOPS", "3"))
+
+
+class Route(str, Enum):
+    """Nodes the router can send the conversation to."""
+
+    zerodha_agent = "zerodha_agent"
+    financial_analyst = "financial_analyst"
+    end_conversation = "end_conversation"
+
+
+ZERODHA_KEYWORDS = (
+    "holding", "holdings", "portfolio", "position", "positions", "order", "orders",
+    "gtt", "buy", "sell", "trade", "trades", "margin", "margins", "funds", "ltp",
+    "ohlc", "quote", "quotes", "instrument", "instruments", "mutual fund", "mf",
+    "kite", "zerodha", "nse", "bse", "nifty", "sensex", "profile", "p&l", "pnl",
+)
+FINANCIAL_KEYWORDS = (
+    "fundamental", "fundamentals", "income statement", "income statements", "balance sheet",
+    "balance sheets", "cash flow", "cash flows", "revenue", "earnings", "eps", "net income",
+    "valuation", "p/e", "sec", "filing", "filings", "10-k", "10-q", "crypto", "bitcoin",
+    "btc", "eth", "ethereum", "nasdaq", "nyse", "s&p", "us stock", "us stocks", "global",
+)
+END_KEYWORDS = (
+    "hi", "hello", "hey", "thanks", "thank you", "thx", "bye", "goodbye",
+    "ok", "okay", "great", "cool", "summarize", "summarise", "summary",
+)
+
+_ZERODHA_PATTERN = re.compile(r"(?<![\w&])(" + "|".join(re.escape(k) for k in ZERODHA_KEYWORDS) + r")(?![\w&])")
+_FINANCIAL_PATTERN = re.compile(r"(?<![\w&])(" + "|".join(re.escape(k) for k in FINANCIAL_KEYWORDS) + r")(?![\w&/-])")
+_END_PATTERN = re.compile(r"^\W*(" + "|".join(re.escape(k) for k in END_KEYWORDS) + r")\b[\W\s]*$")
+
+
+@dataclass
+class RouterStats:
+    """Counters of routing decisions by tier."""
+
+    fast_path: int = 0
+    llm: int = 0
+    guard: int = 0
+
+    @property
+    def fast_path_rate(self) -> float:
+        total = self.fast_path + self.llm
+        return self.fast_path / total if total else 0.0
+
+
+router_stats = RouterStats()
+
+
+def route_by_rules(messages: list[dict]) -> tuple[list[str], float]:
+    """Classify the next hop from the conversation without calling a model.
+
+    Args:
+        messages: Conversation so far as {"role", "content"} dicts.
+
+    Returns:
+        tuple[list[str], float]: The chosen routes and a confidence in [0, 1].
+        Several specialist routes mean the agents run in parallel; the list
+        is empty when no rule applies.
+    """
+    if not messages:
+        return [], 0.0
+
+    last = messages[-1]
+    content = str(last.get("content") or "").strip().lower()
+
+    # Only user intent is classified here, following up on an answer is up to the LLM router
+    if last.get("role") != "user" or not content:
+        return [], 0.0
+
+    hits = {
+        "zerodha_agent": len(_ZERODHA_PATTERN.findall(content)),
+        "financial_analyst": len(_FINANCIAL_PATTERN.findall(content)),
+    }
+    if _END_PATTERN.match(content) and not any(hits.values()):
+        return ["end_conversation"], 0.9
+
+    routes = [route for route, count in hits.items() if count]
+    if not routes:
+        return [], 0.0
+    return routes, 0.95 if max(hits.values()) >= 2 else 0.85
+
+
+def should_stop(messages: list[dict], hops: int, max_hops: int = ROUTER_MAX_HOPS) -> str | None:
+    """Return why the current turn must end regardless of the router, if it must.
+
+    The turn ends once ``max_hops`` rounds of specialists have run, and as
+    soon as the agents repeat their previous answer word for word, which
+    means another round would only loop.
+
+    Args:
+        messages: Conversation so far as {"role", "content"} dicts.
+        hops: Specialist rounds run in the current turn.
+        max_hops: Budget of specialist rounds per turn.
+    """
+    if hops >= max_hops:
+        return f"hop budget of {max_hops} reached"
+
+    answers = []
+    for message in reversed(messages):
+        if message.get("role") != "assistant":
+            break
+        answers.append(message.get("content"))
+    if len(answers) >= 2 and answers[0] == answers[1]:
+        return "agent repeated its previous answer"
+    return None
+
+
+def log_route(route: str, tier: str) -> None:
+    """Record a routing decision and log the running fast-path hit rate."""
+    if tier == "fast_path":
+        router_stats.fast_path += 1
+    elif tier == "guard":
+        router_stats.guard += 1
+    else:
+        router_stats.llm += 1
+    logging.debug(
+        f"Routed to {route} via {tier} (fast-path rate {router_stats.fast_path_rate:.0%}, "
+        f"{router_stats.fast_path} fast / {router_stats.llm} llm / {router_stats.guard} guard)"
+    )
@@ -0,0 +1,131 @@
+"""Process-wide asyncio runtime for the synchronous Streamlit apps.
+
+One loop thread runs the coroutines of every session, so they all share
+the MCP session pool of that loop.
+"""
+
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from typing import Any, TypeVar
+import threading
+import asyncio
+import logging
+import queue
+import os
+
+from app.utils.mcp_client import get_mcp_pool
+from app.tools.render_pool import get_render_pool
+
+T = TypeVar("T")
+
+# Seconds to wait for the loop thread to come up
+RUNTIME_READY_TIMEOUT = float(os.getenv("RUNTIME_READY_TIMEOUT", "10"))
+# Maximum seconds without any item from a streamed coroutine
+STREAM_IDLE_TIMEOUT = float(os.getenv("STREAM_IDLE_TIMEOUT", "120"))
+
+
+class AsyncRuntime:
+    """One event loop in a daemon thread, shared by every caller in the process."""
+
+    def __init__(self, ready_timeout: float = RUNTIME_READY_TIMEOUT) -> None:
+        self.ready_timeout = ready_timeout
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and self._ready.is_set()
+
+    def start(self) -> None:
+        """Start the loop thread if needed and block until the loop is running."""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._ready.clear()
+                self._thread = threading.Thread(target=self._run, name="async-runtime", daemon=True)
+                self._thread.start()
+        if not self._ready.wait(self.ready_timeout):
+            raise RuntimeError(f"The async runtime did not start within {self.ready_timeout} seconds")
+
+    def _run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        # Signal readiness from inside the loop, once it is actually running
+        self.loop.call_soon(self._ready.set)
+        try:
+            self.loop.run_forever()
+        except Exception as e:
+            logging.error(f"Async runtime loop failed: {e}")
+        finally:
+            self._ready.clear()
+            self.loop.close()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = 30) -> T:
+        """Run a coroutine on the runtime loop and wait for its result.
+
+        Raises:
+            TimeoutError: If the coroutine takes longer than ``timeout`` seconds.
+        """
+        if not self.running:
+            self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stream(self, agen: AsyncIterator[T], idle_timeout: float = STREAM_IDLE_TIMEOUT) -> Iterator[T]:
+        """Iterate an async generator running on the runtime loop, item by item.
+
+        Items are handed over through a queue as soon as they are produced, so
+        there is no overall deadline, only ``idle_timeout`` seconds between items.
+
+        Raises:
+            TimeoutError: If no item arrives within ``idle_timeout`` seconds.
+        """
+        if not self.running:
+            self.start()
+
+        items: queue.Queue = queue.Queue()
+        done = object()
+
+        async def pump() -> None:
+            try:
+                async for item in agen:
+                    items.put(item)
+            except Exception as e:
+                items.put(e)
+            finally:
+                items.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=idle_timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No progress for {idle_timeout:.0f} seconds")
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stop the producer if the consumer went away (rerun, error or timeout)
+            future.cancel()
+
+    async def _close(self) -> None:
+        await get_render_pool().close()
+        await get_mcp_pool().close()
+
+    def shutdown(self, timeout: float = 10) -> None:
+        """Close the MCP servers and render workers, then stop the loop."""
+        if not self.running:
+            return
+        try:
+            self.run(self._close(), timeout=timeout)
+        except Exception as e:
+            logging.error(f"Async runtime cleanup failed: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=timeout)
@@ -17,11 +17,36 @@ if missing_vars:
     sys.exit(1)
 
 if __name__ == "__main__":
-    print("🚀 Starting Agentic AI...")
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=int(os.getenv("PORT", "8000")),
-        reload=True,
-        log_level="info"
-    ) 
\ No newline at end of file
+    from app.core.config import get_settings
+
+    settings = get_settings()
+    if settings.production:
+        print(f"🚀 Starting Agentic AI in production mode with {settings.workers} workers...")
+        if settings.workers > 1 and os.getenv("CHECKPOINTER", "memory").lower() == "memory":
+            print("Warning: conversations are kept per worker, set CHECKPOINTER=sqlite to share them")
+        if settings.workers > 1 and not os.getenv("CHART_ARTIFACT_DIR"):
+            # Charts are served by whichever worker gets the request, not the one that rendered them
+            print("Error: chart artifacts are kept per worker, set CHART_ARTIFACT_DIR to a directory shared by the workers")
+            sys.exit(1)
+        uvicorn.run(
+            "app.main:app",
+            host=settings.host,
+            port=settings.port,
+            workers=settings.workers,
+            loop=settings.loop,
+            http=settings.http,
+            timeout_keep_alive=settings.keep_alive,
+            backlog=settings.backlog,
+            reload=False,
+            access_log=settings.debug,
+            log_level="info"
+        )
+    else:
+        print("🚀 Starting Agentic AI...")
+        uvicorn.run(
+            "app.main:app",
+            host=settings.host,
+            port=settings.port,
+            reload=True,
+            log_level="info"
+        ) 
@@ -0,0 +1,14 @@
+import os
+
+# app.utils.model refuses to import without credentials; the tests never call a model
+for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SESSION_TOKEN", "OPENAI_API_KEY"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-west-2")
+os.environ.setdefault("CHECKPOINTER", "memory")
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
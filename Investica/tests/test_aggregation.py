@@ -0,0 +1,49 @@
+import pandas as pd
+import pytest
+
+from app.agents.financial_analyst.aggregation import lttb, reduce_prices, resample_ohlc
+
+
+def daily_bars(start: str, end: str) -> list[dict]:
+    days = pd.date_range(start, end, freq="D")
+    return [
+        {"open": i, "high": i + 2, "low": i - 1, "close": i + 1, "volume": 10, "time": day.strftime("%Y-%m-%dT%H:%M:%SZ")}
+        for i, day in enumerate(days, start=1)
+    ]
+
+
+def test_weekly_bars_are_stamped_with_the_monday_they_start_on():
+    bars = resample_ohlc(daily_bars("2024-01-01", "2024-01-30"), "week")
+
+    assert [bar["time"] for bar in bars] == [
+        "2024-01-01T00:00:00Z", "2024-01-08T00:00:00Z", "2024-01-15T00:00:00Z",
+        "2024-01-22T00:00:00Z", "2024-01-29T00:00:00Z",
+    ]
+    assert bars[0] == {"time": "2024-01-01T00:00:00Z", "open": 1, "high": 9, "low": 0, "close": 8, "volume": 70}
+    # The last bar holds only the 29th and 30th and is not dated after the range
+    assert (bars[-1]["open"], bars[-1]["close"], bars[-1]["volume"]) == (29, 31, 20)
+
+
+@pytest.mark.parametrize(
+    ("interval", "expected"),
+    [
+        ("month", ["2024-01-01T00:00:00Z", "2024-02-01T00:00:00Z", "2024-03-01T00:00:00Z"]),
+        ("quarter", ["2024-01-01T00:00:00Z"]),
+        ("year", ["2024-01-01T00:00:00Z"]),
+    ],
+)
+def test_longer_bars_are_stamped_with_the_start_of_their_period(interval, expected):
+    bars = resample_ohlc(daily_bars("2024-01-15", "2024-03-10"), interval)
+    assert [bar["time"] for bar in bars] == expected
+
+
+def test_lttb_keeps_the_ends_and_the_requested_number_of_points():
+    prices = daily_bars("2024-01-01", "2024-04-30")
+    reduced = lttb(prices, 10)
+    assert len(reduced) == 10
+    assert reduced[0] is prices[0] and reduced[-1] is prices[-1]
+
+
+def test_reduce_prices_rejects_unknown_intervals():
+    with pytest.raises(ValueError):
+        reduce_prices(daily_bars("2024-01-01", "2024-01-05"), "day", resample_to="fortnight")
@@ -0,0 +1,31 @@
+from app.tools.artifacts import ArtifactStore
+
+
+def test_artifacts_are_shared_through_the_directory(tmp_path):
+    rendering_worker = ArtifactStore(shared_dir=str(tmp_path))
+    other_worker = ArtifactStore(shared_dir=str(tmp_path))
+
+    artifact = rendering_worker.put(b"\x89PNG chart", "image/png", {"chart_type": "bar"})
+
+    loaded = other_worker.get(artifact.handle)
+    assert loaded is not None
+    assert loaded.data == b"\x89PNG chart"
+    assert loaded.mime_type == "image/png"
+    assert other_worker.stats.disk_hits == 1
+
+
+def test_evicted_artifacts_are_loaded_back(tmp_path):
+    store = ArtifactStore(max_bytes=10, shared_dir=str(tmp_path))
+    first = store.put(b"0123456789", "image/webp")
+    store.put(b"abcdefghij", "image/webp")
+
+    assert store.stats.evictions == 1
+    assert store.get(first.handle).data == b"0123456789"
+
+
+def test_without_a_directory_artifacts_stay_in_the_process():
+    store = ArtifactStore(shared_dir=None)
+    artifact = store.put(b"chart", "image/png")
+
+    assert store.get(artifact.handle).data == b"chart"
+    assert ArtifactStore(shared_dir=None).get(artifact.handle) is None
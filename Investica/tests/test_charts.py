@@ -0,0 +1,30 @@
+import base64
+
+import pytest
+
+from app.tools import charts
+from app.tools.chart_renderers import render_box_plot, render_pie_chart
+from app.tools.render_pool import get_render_pool
+from app.tools.rendering import get_profile
+
+
+def test_pie_and_box_renderers_encode_an_image():
+    profile = get_profile(None)
+    pie = render_pie_chart({"labels": ["a", "b"], "sizes": [1, 3], "title": None}, profile)
+    box = render_box_plot(
+        {"data": {"a": [1, 2, 3], "b": [2, 4, 8]}, "title": None, "x_label": None, "y_label": None}, profile
+    )
+    assert pie.data and pie.mime_type == profile.mime_type
+    assert box.data and box.mime_type == profile.mime_type
+
+
+@pytest.mark.anyio
+async def test_chart_helpers_render_through_the_render_pool():
+    try:
+        result = await charts.create_box_plot({"a": [1, 2, 3], "b": [2, 4, 8]}, title="Spread")
+    finally:
+        await get_render_pool().close()
+
+    assert result["chart_type"] == "box_plot"
+    assert result["categories"] == 2
+    assert base64.b64decode(result["image"])
@@ -0,0 +1,71 @@
+import operator
+import time
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from app.utils.checkpointer import SQLiteCheckpointSaver
+
+
+class CounterState(TypedDict):
+    turns: Annotated[list[int], operator.add]
+
+
+def build_graph(saver: SQLiteCheckpointSaver):
+    builder = StateGraph(CounterState)
+    builder.add_node("count", lambda state: {"turns": [len(state["turns"]) + 1]})
+    builder.add_edge(START, "count")
+    builder.add_edge("count", END)
+    return builder.compile(checkpointer=saver)
+
+
+def config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def count_rows(saver: SQLiteCheckpointSaver, table: str, thread_id: str) -> int:
+    (count,) = saver._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE thread_id = ?", (thread_id,)).fetchone()
+    return count
+
+
+def test_threads_keep_only_their_newest_checkpoints(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"), max_checkpoints=3, ttl=0)
+    graph = build_graph(saver)
+    for _ in range(5):
+        graph.invoke({"turns": []}, config("a"))
+
+    # Compaction drops history, never the state
+    assert graph.get_state(config("a")).values["turns"] == [1, 2, 3, 4, 5]
+    assert len(list(saver.list(config("a")))) == 3
+    assert count_rows(saver, "checkpoints", "a") == 3
+    kept = {row[0] for row in saver._conn.execute("SELECT checkpoint_id FROM checkpoints WHERE thread_id = 'a'")}
+    written = {row[0] for row in saver._conn.execute("SELECT checkpoint_id FROM writes WHERE thread_id = 'a'")}
+    assert written <= kept
+    saver.close()
+
+
+def test_state_survives_a_new_saver_on_the_same_file(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    saver = SQLiteCheckpointSaver(path, max_checkpoints=3, ttl=0)
+    build_graph(saver).invoke({"turns": []}, config("a"))
+    saver.close()
+
+    reopened = SQLiteCheckpointSaver(path, max_checkpoints=3, ttl=0)
+    graph = build_graph(reopened)
+    graph.invoke({"turns": []}, config("a"))
+    assert graph.get_state(config("a")).values["turns"] == [1, 2]
+    reopened.close()
+
+
+def test_idle_threads_are_evicted(tmp_path):
+    saver = SQLiteCheckpointSaver(str(tmp_path / "checkpoints.db"), ttl=60)
+    graph = build_graph(saver)
+    graph.invoke({"turns": []}, config("idle"))
+    graph.invoke({"turns": []}, config("active"))
+    saver._conn.execute("UPDATE threads SET updated_at = ? WHERE thread_id = 'idle'", (time.time() - 120,))
+
+    assert saver.evict_idle() == 1
+    assert count_rows(saver, "checkpoints", "idle") == 0
+    assert count_rows(saver, "writes", "idle") == 0
+    assert graph.get_state(config("active")).values["turns"] == [1]
+    saver.close()
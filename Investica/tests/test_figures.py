@@ -0,0 +1,42 @@
+from app.tools.figures import category_positions, get_template, set_category_ticks
+
+
+def test_category_positions():
+    positions, labels = category_positions(["Jan", "Feb", "Mar"])
+    assert positions.tolist() == [0.0, 1.0, 2.0]
+    assert labels == ["Jan", "Feb", "Mar"]
+
+    positions, labels = category_positions([1, 2.5, 4])
+    assert positions.tolist() == [1.0, 2.5, 4.0]
+    assert labels is None
+
+
+def test_reset_unrotates_the_ticks_of_a_categorical_chart():
+    template = get_template("line")
+    ax = template.reset("Categories")
+    ax.plot([0, 1, 2], [1, 2, 3])
+    set_category_ticks(ax, [0, 1, 2], ["a", "b", "c"])
+    template.canvas.draw()
+    assert {label.get_rotation() for label in ax.get_xticklabels()} == {45.0}
+
+    # A numeric chart with many more ticks than the categorical one had
+    ax = template.reset("Numbers")
+    ax.plot(range(0, 1000, 10), range(100))
+    template.canvas.draw()
+
+    labels = ax.get_xticklabels()
+    assert len(labels) > 3
+    assert {(label.get_rotation(), label.get_horizontalalignment()) for label in labels} == {(0.0, "center")}
+    assert not any(label.get_text() in {"a", "b", "c"} for label in labels)
+
+
+def test_reset_removes_the_previous_chart():
+    template = get_template("bar")
+    for _ in range(5):
+        ax = template.reset("Bars")
+        ax.bar([0, 1], [1, 2])
+        ax.hist([1, 2, 2, 3])
+        ax.plot([0, 1], [1, 2])
+
+    template.reset()
+    assert (len(ax.containers), len(ax.patches), len(ax.lines)) == (0, 0, 0)
@@ -0,0 +1,23 @@
+from app.agents.financial_analyst.formatting import format_records, round_float, to_csv
+
+
+def test_sub_cent_prices_keep_their_significant_digits():
+    assert format_records({"price": 0.00001234}) == '{"price":1.234e-05}'
+    assert round_float(0.000012345678) == 0.0000123457
+
+
+def test_prices_and_large_values_are_rounded_to_decimal_places():
+    assert round_float(187.43219876) == 187.4322
+    assert round_float(123456789.123456) == 123456789.1235
+    assert round_float(-0.5) == -0.5
+    assert round_float(0.0) == 0.0
+
+
+def test_negative_precision_disables_rounding():
+    assert format_records({"price": 1.23456789}, precision=-1) == '{"price":1.23456789}'
+
+
+def test_projection_and_csv():
+    records = [{"ticker": "AAPL", "close": 1.5, "volume": 10}, {"ticker": "MSFT", "close": 2.25}]
+    assert format_records(records, fields=["ticker", "close"]) == '[{"ticker":"AAPL","close":1.5},{"ticker":"MSFT","close":2.25}]'
+    assert to_csv(records) == "ticker,close,volume\nAAPL,1.5,10\nMSFT,2.25,\n"
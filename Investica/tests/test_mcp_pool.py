@@ -0,0 +1,194 @@
+import asyncio
+
+import anyio
+import pytest
+from mcp.types import CallToolResult, Tool as MCPTool
+
+from app.utils.mcp_client import MCPServer, MCPSessionPool, _PooledServer
+
+CONFIG = {"command": "python", "args": ["server.py"]}
+
+
+def pooled_entry(pool: MCPSessionPool) -> _PooledServer:
+    entry = _PooledServer(MCPServer("test", CONFIG))
+    pool._entries["test"] = entry
+    return entry
+
+
+@pytest.mark.anyio
+async def test_cancelled_health_check_releases_the_borrow():
+    pool = MCPSessionPool(health_check_interval=0)
+    entry = pooled_entry(pool)
+
+    async def cancelled(timeout):
+        raise asyncio.CancelledError
+
+    entry.is_healthy = cancelled
+    with pytest.raises(asyncio.CancelledError):
+        await pool.acquire("test", CONFIG)
+    assert entry.in_use == 0
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_failed_reconnect_releases_the_borrow():
+    pool = MCPSessionPool(health_check_interval=0)
+    entry = pooled_entry(pool)
+
+    async def unhealthy(timeout):
+        return False
+
+    async def refused(timeout):
+        raise ConnectionError("refused")
+
+    entry.is_healthy = unhealthy
+    entry.connect = refused
+    with pytest.raises(ConnectionError):
+        await pool.acquire("test", CONFIG)
+    assert entry.in_use == 0
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_session_keys_get_their_own_connection(monkeypatch):
+    async def connect(self, timeout):
+        self.last_checked = 0
+
+    monkeypatch.setattr(_PooledServer, "connect", connect)
+    pool = MCPSessionPool()
+
+    alice = await pool.acquire("test", CONFIG, "thread-a")
+    bob = await pool.acquire("test", CONFIG, "thread-b")
+    shared = await pool.acquire("test", CONFIG)
+
+    assert len({id(alice), id(bob), id(shared)}) == 3
+    assert alice.name == bob.name == "test"
+    assert await pool.acquire("test", CONFIG, "thread-a") is alice
+
+    await pool.release("test", "thread-a")
+    assert pool._entries["test:thread-a"].in_use == 1
+    assert pool._entries["test:thread-b"].in_use == 1
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_key_locks_do_not_outlive_their_borrows(monkeypatch):
+    async def connect(self, timeout):
+        self.last_checked = 0
+
+    monkeypatch.setattr(_PooledServer, "connect", connect)
+    pool = MCPSessionPool()
+
+    for thread in range(5):
+        await pool.acquire("test", CONFIG, f"thread-{thread}")
+        await pool.release("test", f"thread-{thread}")
+
+    assert len(pool._locks) == 0
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_sessions_do_not_crowd_out_shared_servers(monkeypatch):
+    async def connect(self, timeout):
+        self.last_checked = 0
+
+    monkeypatch.setattr(_PooledServer, "connect", connect)
+    pool = MCPSessionPool(max_size=1, max_sessions=2, wait_timeout=0.05)
+
+    await pool.acquire("kite", CONFIG, "thread-a")
+    await pool.acquire("kite", CONFIG, "thread-b")
+    shared = await pool.acquire("test", CONFIG)
+    assert shared is pool._entries["test"].server
+
+    with pytest.raises(TimeoutError):
+        await pool.acquire("kite", CONFIG, "thread-c")
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_full_pool_waits_for_a_release(monkeypatch):
+    async def connect(self, timeout):
+        self.last_checked = 0
+
+    monkeypatch.setattr(_PooledServer, "connect", connect)
+    pool = MCPSessionPool(max_size=1)
+
+    await pool.acquire("first", CONFIG)
+    waiting = asyncio.create_task(pool.acquire("second", CONFIG))
+    await asyncio.sleep(0.01)
+    assert not waiting.done()
+
+    await pool.release("first")
+    second = await asyncio.wait_for(waiting, timeout=1)
+    assert second.name == "second"
+    assert "first" not in pool
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_sessions_use_their_own_idle_timeout(monkeypatch):
+    async def connect(self, timeout):
+        self.last_checked = 0
+
+    monkeypatch.setattr(_PooledServer, "connect", connect)
+    pool = MCPSessionPool(idle_timeout=0, session_idle_timeout=3600)
+
+    await pool.acquire("test", CONFIG)
+    await pool.acquire("kite", CONFIG, "thread-a")
+    await pool.release("test")
+    await pool.release("kite", "thread-a")
+    await pool.evict_idle()
+
+    assert "test" not in pool
+    assert "kite:thread-a" in pool
+    await pool.close()
+
+
+class FakeSession:
+    def __init__(self, error: BaseException | None = None):
+        self.error = error
+        self.calls = 0
+
+    async def call_tool(self, name, arguments=None, read_timeout_seconds=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return CallToolResult(content=[])
+
+
+@pytest.mark.anyio
+async def test_broken_session_is_reconnected_before_retrying(monkeypatch):
+    sessions = [FakeSession(anyio.ClosedResourceError()), FakeSession()]
+
+    async def connect(self, timeout):
+        self.server.session = sessions.pop(0)
+        self.last_checked = 0
+
+    async def close(self):
+        self.server.session = None
+
+    monkeypatch.setattr(_PooledServer, "connect", connect)
+    monkeypatch.setattr(_PooledServer, "close", close)
+    monkeypatch.setattr("app.utils.mcp_client.MCP_TOOL_RETRY_BACKOFF", 0)
+    pool = MCPSessionPool()
+    server = await pool.acquire("test", CONFIG)
+    dead = server.session
+
+    tool = server.create_tool_instance(MCPTool(name="get_quote", inputSchema={"type": "object"}))
+    result = await tool.function()
+
+    assert not result.isError
+    assert dead.calls == 1
+    assert server.session.calls == 1
+    await pool.close()
+
+
+@pytest.mark.anyio
+async def test_broken_session_is_not_retried_without_a_pool():
+    server = MCPServer("test", CONFIG)
+    server.session = FakeSession(anyio.ClosedResourceError())
+
+    tool = server.create_tool_instance(MCPTool(name="get_quote", inputSchema={"type": "object"}))
+    with pytest.raises(anyio.ClosedResourceError):
+        await tool.function()
+    assert server.session.calls == 1
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from app.agents.financial_analyst.price_store import PriceStore, merge_ranges, missing_ranges
+
+
+def d(day: int) -> date:
+    return date(2024, 1, day)
+
+
+def test_missing_ranges_of_an_empty_store_is_the_whole_range():
+    assert missing_ranges([], d(1), d(31)) == [(d(1), d(31))]
+
+
+def test_missing_ranges_finds_the_gaps_between_covered_ranges():
+    covered = [(d(10), d(15)), (d(1), d(5))]
+    assert missing_ranges(covered, d(1), d(20)) == [(d(6), d(9)), (d(16), d(20))]
+
+
+def test_missing_ranges_inside_a_covered_range_is_empty():
+    assert missing_ranges([(d(1), d(31))], d(3), d(7)) == []
+
+
+def test_missing_ranges_ignores_ranges_outside_the_request():
+    covered = [(d(1), d(2)), (d(25), d(31))]
+    assert missing_ranges(covered, d(10), d(12)) == [(d(10), d(12))]
+
+
+def test_merge_ranges_joins_overlapping_and_adjacent_ranges():
+    ranges = [(d(10), d(12)), (d(1), d(5)), (d(6), d(8)), (d(11), d(20))]
+    assert merge_ranges(ranges) == [(d(1), d(8)), (d(10), d(20))]
+
+
+def test_merge_ranges_keeps_disjoint_ranges():
+    assert merge_ranges([(d(1), d(2)), (d(4), d(5))]) == [(d(1), d(2)), (d(4), d(5))]
+
+
+@pytest.mark.anyio
+async def test_bars_keep_the_day_the_api_gives_them(tmp_path):
+    # Late bars of a negative UTC offset exchange fall on the next day in UTC
+    bars = {
+        "2024-01-02": [{"time": "2024-01-02T19:00:00-05:00", "close": 1.0}],
+        "2024-01-03": [{"time": "2024-01-03T19:00:00-05:00", "close": 2.0}],
+    }
+    fetched = []
+
+    async def fetch(start, end):
+        fetched.append((start, end))
+        return [bar for day, day_bars in bars.items() if start <= day <= end for bar in day_bars]
+
+    store = PriceStore(str(tmp_path))
+    first = await store.get_prices("stock", "AAPL", "day", 1, "2024-01-02", "2024-01-02", fetch)
+    second = await store.get_prices("stock", "AAPL", "day", 1, "2024-01-03", "2024-01-03", fetch)
+    again = await store.get_prices("stock", "AAPL", "day", 1, "2024-01-02", "2024-01-03", fetch)
+
+    assert [bar["close"] for bar in first] == [1.0]
+    assert [bar["close"] for bar in second] == [2.0]
+    assert [bar["close"] for bar in again] == [1.0, 2.0]
+    assert fetched == [("2024-01-02", "2024-01-02"), ("2024-01-03", "2024-01-03")]
@@ -0,0 +1,81 @@
+from app.tools.render_cache import RenderCache, chart_key
+from app.tools.rendering import EncodedImage, get_profile
+
+SPEC = {"data": [1.0, 2.0, 2.5], "title": "Returns", "bins": 10, "x_label": None, "y_label": None, "color": "skyblue"}
+
+
+def image(size: int) -> EncodedImage:
+    return EncodedImage(b"x" * size, "image/webp", 72, "preview")
+
+
+def render_histogram(spec, profile):
+    return image(10)
+
+
+def render_bar_chart(spec, profile):
+    return image(10)
+
+
+def test_chart_key_depends_on_everything_the_chart_depends_on():
+    profile = get_profile(None)
+    key = chart_key(render_histogram, SPEC, profile)
+
+    assert chart_key(render_histogram, dict(reversed(SPEC.items())), profile) == key
+    assert chart_key(render_histogram, {**SPEC, "data": [1.0, 2.0, 2.6]}, profile) != key
+    assert chart_key(render_histogram, {**SPEC, "title": "Other"}, profile) != key
+    assert chart_key(render_bar_chart, SPEC, profile) != key
+    assert chart_key(render_histogram, SPEC, get_profile("export")) != key
+
+
+def test_chart_key_tells_numbers_from_strings():
+    profile = get_profile(None)
+    assert chart_key(render_histogram, {"data": [1, 2]}, profile) != chart_key(
+        render_histogram, {"data": ["1", "2"]}, profile
+    )
+
+
+def test_get_or_render_renders_each_chart_once():
+    cache = RenderCache(enabled=True)
+    renders = []
+
+    def render(spec, profile):
+        renders.append(spec)
+        return image(10)
+
+    first = cache.get_or_render(render, SPEC)
+    second = cache.get_or_render(render, dict(SPEC))
+    assert first is second
+    assert len(renders) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_cache_is_bounded_by_bytes_and_evicts_the_least_recently_used():
+    cache = RenderCache(max_bytes=25, enabled=True)
+    cache.put("a", image(10))
+    cache.put("b", image(10))
+    cache.get("a")
+    cache.put("c", image(10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.snapshot()["bytes"] == 20
+    assert cache.stats.evictions == 1
+
+
+def test_images_larger_than_the_cache_are_not_kept():
+    cache = RenderCache(max_bytes=5, enabled=True)
+    cache.put("big", image(10))
+    assert cache.get("big") is None
+
+
+def test_disabled_cache_always_renders():
+    cache = RenderCache(enabled=False)
+    renders = []
+
+    def render(spec, profile):
+        renders.append(spec)
+        return image(1)
+
+    cache.get_or_render(render, SPEC)
+    cache.get_or_render(render, SPEC)
+    assert len(renders) == 2
@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import pytest
+
+from app.agents.financial_analyst.response_cache import ResponseCache, normalize_url, ttl_for
+
+NEWS_URL = "https://api.financialdatasets.ai/news/?ticker=AAPL"
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch(self, url):
+        self.calls += 1
+        return {"version": self.calls}
+
+
+def age_entry(cache: ResponseCache, url: str, seconds: float) -> None:
+    key = normalize_url(url)
+    _, data = cache._entries[key]
+    cache._entries[key] = (time.time() - seconds, data)
+
+
+def test_equivalent_urls_share_a_key():
+    assert normalize_url("https://API.x.ai/prices?ticker=AAPL&limit=4&cursor=") == normalize_url(
+        "https://api.x.ai/prices/?limit=4&ticker=AAPL"
+    )
+
+
+def test_endpoints_get_their_own_freshness():
+    assert ttl_for("https://api.x.ai/prices/snapshot/?ticker=AAPL") == (5, 10)
+    assert ttl_for("https://api.x.ai/financials/income-statements/") == (24 * 3600, 7 * 24 * 3600)
+
+
+@pytest.mark.anyio
+async def test_fresh_entries_are_served_without_fetching():
+    cache, upstream = ResponseCache(db_path=None), Upstream()
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 1}
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 1}
+    assert upstream.calls == 1
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.anyio
+async def test_stale_entries_are_served_while_refreshing_in_the_background():
+    cache, upstream = ResponseCache(db_path=None), Upstream()
+    await cache.get_or_fetch(NEWS_URL, upstream.fetch)
+    ttl, stale = ttl_for(NEWS_URL)
+    age_entry(cache, NEWS_URL, ttl + stale / 2)
+
+    # The stale response comes back at once, a single refresh runs behind it
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 1}
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 1}
+    assert cache.stats.stale_hits == 2
+    await asyncio.gather(*cache._refreshing.values())
+
+    assert upstream.calls == 2
+    assert cache.stats.refreshes == 1
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 2}
+
+
+@pytest.mark.anyio
+async def test_entries_past_the_stale_window_are_fetched_again():
+    cache, upstream = ResponseCache(db_path=None), Upstream()
+    await cache.get_or_fetch(NEWS_URL, upstream.fetch)
+    ttl, stale = ttl_for(NEWS_URL)
+    age_entry(cache, NEWS_URL, ttl + stale + 1)
+
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 2}
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.anyio
+async def test_a_failed_refresh_keeps_the_stale_entry():
+    cache, upstream = ResponseCache(db_path=None), Upstream()
+    await cache.get_or_fetch(NEWS_URL, upstream.fetch)
+    ttl, stale = ttl_for(NEWS_URL)
+    age_entry(cache, NEWS_URL, ttl + 1)
+
+    async def failing(url):
+        raise ConnectionError("upstream down")
+
+    assert await cache.get_or_fetch(NEWS_URL, failing) == {"version": 1}
+    await asyncio.gather(*cache._refreshing.values())
+    assert cache.stats.refresh_errors == 1
+    assert await cache.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 1}
+
+
+@pytest.mark.anyio
+async def test_the_sqlite_tier_survives_a_restart(tmp_path):
+    db_path = str(tmp_path / "responses.db")
+    cache, upstream = ResponseCache(db_path=db_path), Upstream()
+    await cache.get_or_fetch(NEWS_URL, upstream.fetch)
+    cache.close()
+
+    restarted = ResponseCache(db_path=db_path)
+    assert await restarted.get_or_fetch(NEWS_URL, upstream.fetch) == {"version": 1}
+    assert restarted.stats.disk_hits == 1
+    assert upstream.calls == 1
+    restarted.close()
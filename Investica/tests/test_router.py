@@ -0,0 +1,95 @@
+from pydantic_ai.messages import ModelResponse, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+import pytest
+
+from app.utils.router import route_by_rules, should_stop
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+def assistant(content):
+    return {"role": "assistant", "content": content}
+
+
+def test_rules_route_clear_user_intent():
+    assert route_by_rules([user("Show my holdings and open orders")]) == (["zerodha_agent"], 0.95)
+    assert route_by_rules([user("AAPL income statement")]) == (["financial_analyst"], 0.85)
+    routes, _ = route_by_rules([user("Compare my portfolio with AAPL revenue")])
+    assert routes == ["zerodha_agent", "financial_analyst"]
+    assert route_by_rules([user("thanks!")]) == (["end_conversation"], 0.9)
+
+
+def test_rules_do_not_decide_after_a_specialist_answer():
+    # Following up on an answer is left to should_stop and the router LLM
+    assert route_by_rules([user("Show my holdings"), assistant("You hold 10 INFY")]) == ([], 0.0)
+
+
+def test_rules_abstain_without_a_match():
+    assert route_by_rules([user("What should I do next?")]) == ([], 0.0)
+    assert route_by_rules([]) == ([], 0.0)
+
+
+def test_should_stop_on_hop_budget():
+    assert should_stop([user("hi")], hops=3, max_hops=3) == "hop budget of 3 reached"
+    assert should_stop([user("hi")], hops=2, max_hops=3) is None
+
+
+def test_should_stop_on_repeated_answer():
+    messages = [user("Show my holdings"), assistant("You hold 10 INFY"), assistant("You hold 10 INFY")]
+    assert should_stop(messages, hops=2) == "agent repeated its previous answer"
+    assert should_stop(messages[:2], hops=1) is None
+
+
+class FakeClient:
+    async def cleanup(self):
+        pass
+
+
+class FakeSpecialist:
+    """Stands in for the Zerodha agent, answering each round differently."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def run(self, prompt):
+        self.prompts.append(prompt)
+
+        class Result:
+            output = f"round {len(self.prompts)}: you hold 10 INFY"
+
+        return Result()
+
+
+@pytest.mark.anyio
+async def test_specialist_answer_can_trigger_a_second_hop(monkeypatch):
+    from app import graph
+
+    specialist = FakeSpecialist()
+    session_keys = []
+
+    async def get_fake_agent(session_key=None):
+        session_keys.append(session_key)
+        return FakeClient(), specialist
+
+    monkeypatch.setattr(graph, "get_zerodha_agent", get_fake_agent)
+
+    # The router LLM asks for a second Zerodha round after the first answer, then ends the turn
+    decisions = iter([["zerodha_agent"], ["zerodha_agent"], ["end_conversation"]])
+
+    def route(messages, info: AgentInfo) -> ModelResponse:
+        return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, {"response": next(decisions)})])
+
+    with graph.router_agent.override(model=FunctionModel(route)), \
+            graph.end_conversation_agent.override(model=TestModel(custom_output_text="done")):
+        events = [event async for event in graph.stream_turn("What should I do next?", "second-hop")]
+
+    state = await graph.agentic_flow.aget_state({"configurable": {"thread_id": "second-hop"}})
+    assert len(specialist.prompts) == 2
+    # The Zerodha connection is borrowed for this thread only
+    assert session_keys == ["second-hop", "second-hop"]
+    assert state.values["hops"] == 2
+    assert [event["node"] for event in events if event["type"] == "status"].count("join") == 2
+    assert state.values["messages"][-1] == {"role": "assistant", "content": "done"}
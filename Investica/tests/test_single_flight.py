@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.agents.financial_analyst.single_flight import SingleFlight
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_upstream_call():
+    group = SingleFlight()
+    calls = []
+    release = asyncio.Event()
+
+    async def fetch(url):
+        calls.append(url)
+        await release.wait()
+        return {"url": url}
+
+    waiters = [asyncio.create_task(group.do("AAPL", fetch, "AAPL")) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(*waiters)
+    assert calls == ["AAPL"]
+    assert results == [{"url": "AAPL"}] * 5
+    assert group.snapshot() == {"calls": 1, "coalesced": 4, "inflight": 0}
+
+
+@pytest.mark.anyio
+async def test_different_keys_are_not_coalesced():
+    group = SingleFlight()
+
+    async def fetch(url):
+        return url
+
+    assert await asyncio.gather(group.do("a", fetch, "a"), group.do("b", fetch, "b")) == ["a", "b"]
+    assert group.stats.calls == 2
+
+
+@pytest.mark.anyio
+async def test_every_waiter_gets_the_exception_and_the_key_is_retried():
+    group = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing():
+        await release.wait()
+        raise ConnectionError("upstream down")
+
+    waiters = [asyncio.create_task(group.do("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+    async def working():
+        return "ok"
+
+    assert await group.do("key", working) == "ok"
+
+
+@pytest.mark.anyio
+async def test_cancelling_the_first_caller_does_not_cancel_the_shared_call():
+    group = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(group.do("key", fetch))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first